@@ -8,7 +8,7 @@ from alembic import context
 
 # Import models for autogenerate
 from app.models.base import Base
-from app.models import User, Income, Expense, UCReport, TaxSnapshot
+from app.models import User, Income, Expense, UCReport, TaxSnapshot, StripeEvent
 from app.core.config import settings
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,25 @@
+"""add_subscription_id_index
+
+Revision ID: 5b1e2c7d9a40
+Revises: 0cfcf7c24b9a
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b1e2c7d9a40'
+down_revision = '0cfcf7c24b9a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Stripe subscription webhooks look users up by subscription_id
+    op.create_index(op.f('ix_users_subscription_id'), 'users', ['subscription_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_users_subscription_id'), table_name='users')
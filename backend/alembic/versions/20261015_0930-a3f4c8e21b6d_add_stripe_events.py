@@ -0,0 +1,31 @@
+"""add_stripe_events
+
+Revision ID: a3f4c8e21b6d
+Revises: 5b1e2c7d9a40
+Create Date: 2026-10-15 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f4c8e21b6d'
+down_revision = '5b1e2c7d9a40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Processed Stripe webhook events, for idempotent background processing
+    op.create_table('stripe_events',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('stripe_events')
@@ -0,0 +1,31 @@
+"""add_composite_user_year_indexes
+
+Revision ID: c7d2e9f14a83
+Revises: a3f4c8e21b6d
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d2e9f14a83'
+down_revision = 'a3f4c8e21b6d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Income/expense listings filter by user and tax year, newest first
+    op.create_index('ix_incomes_user_year_date', 'incomes', ['user_id', 'tax_year', sa.text('date_received DESC')], unique=False)
+    op.create_index('ix_expenses_user_year_date', 'expenses', ['user_id', 'tax_year', sa.text('date_paid DESC')], unique=False)
+    
+    # Only one snapshot may exist per user per tax year
+    op.create_index('ix_tax_snapshots_user_year', 'tax_snapshots', ['user_id', 'tax_year'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tax_snapshots_user_year', table_name='tax_snapshots')
+    op.drop_index('ix_expenses_user_year_date', table_name='expenses')
+    op.drop_index('ix_incomes_user_year_date', table_name='incomes')
@@ -0,0 +1,27 @@
+"""add_user_date_indexes
+
+Revision ID: e4b8a1f07c52
+Revises: c7d2e9f14a83
+Create Date: 2026-10-15 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b8a1f07c52'
+down_revision = 'c7d2e9f14a83'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # UC period and monthly aggregates filter by user and a date range
+    op.create_index('ix_incomes_user_date', 'incomes', ['user_id', 'date_received'], unique=False)
+    op.create_index('ix_expenses_user_date', 'expenses', ['user_id', 'date_paid'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_expenses_user_date', table_name='expenses')
+    op.drop_index('ix_incomes_user_date', table_name='incomes')
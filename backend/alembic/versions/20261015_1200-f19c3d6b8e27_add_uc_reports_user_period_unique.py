@@ -0,0 +1,25 @@
+"""add_uc_reports_user_period_unique
+
+Revision ID: f19c3d6b8e27
+Revises: e4b8a1f07c52
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f19c3d6b8e27'
+down_revision = 'e4b8a1f07c52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Bulk report generation relies on ON CONFLICT (user_id, period_start)
+    op.create_index('ix_uc_reports_user_period', 'uc_reports', ['user_id', 'period_start'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_uc_reports_user_period', table_name='uc_reports')
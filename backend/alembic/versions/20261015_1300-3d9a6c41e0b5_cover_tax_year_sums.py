@@ -0,0 +1,38 @@
+"""cover_tax_year_sums
+
+Revision ID: 3d9a6c41e0b5
+Revises: f19c3d6b8e27
+Create Date: 2026-10-15 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3d9a6c41e0b5'
+down_revision = 'f19c3d6b8e27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Tax year sums read amounts straight from the (user_id, tax_year, date) indexes
+    op.drop_index('ix_incomes_user_year_date', table_name='incomes')
+    op.create_index('ix_incomes_user_year_date', 'incomes', ['user_id', 'tax_year', sa.text('date_received DESC')], unique=False, postgresql_include=['amount', 'tax_saved'])
+    op.drop_index('ix_expenses_user_year_date', table_name='expenses')
+    op.create_index('ix_expenses_user_year_date', 'expenses', ['user_id', 'tax_year', sa.text('date_paid DESC')], unique=False, postgresql_include=['amount'])
+    
+    # Every tax year lookup is scoped to a user, so these are redundant
+    op.drop_index('ix_incomes_tax_year', table_name='incomes')
+    op.drop_index('ix_expenses_tax_year', table_name='expenses')
+
+
+def downgrade() -> None:
+    op.create_index('ix_expenses_tax_year', 'expenses', ['tax_year'], unique=False)
+    op.create_index('ix_incomes_tax_year', 'incomes', ['tax_year'], unique=False)
+    
+    op.drop_index('ix_expenses_user_year_date', table_name='expenses')
+    op.create_index('ix_expenses_user_year_date', 'expenses', ['user_id', 'tax_year', sa.text('date_paid DESC')], unique=False)
+    op.drop_index('ix_incomes_user_year_date', table_name='incomes')
+    op.create_index('ix_incomes_user_year_date', 'incomes', ['user_id', 'tax_year', sa.text('date_received DESC')], unique=False)
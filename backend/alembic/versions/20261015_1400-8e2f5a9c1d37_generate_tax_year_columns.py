@@ -0,0 +1,45 @@
+"""generate_tax_year_columns
+
+Revision ID: 8e2f5a9c1d37
+Revises: 3d9a6c41e0b5
+Create Date: 2026-10-15 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e2f5a9c1d37'
+down_revision = '3d9a6c41e0b5'
+branch_labels = None
+depends_on = None
+
+
+def _tax_year_expression(date_column: str) -> str:
+    """UK tax year ("YYYY-YY") of a date column, as of this revision."""
+    start_year = (
+        f"(EXTRACT(YEAR FROM {date_column})::int"
+        f" - (EXTRACT(MONTH FROM {date_column}) * 100 + EXTRACT(DAY FROM {date_column}) < 406)::int)"
+    )
+    return f"{start_year}::text || '-' || lpad((({start_year} + 1) % 100)::text, 2, '0')"
+
+
+def upgrade() -> None:
+    # A column can't be converted to a generated one in place, so re-add it;
+    # dropping it also drops the (user_id, tax_year, date) index, recreated after
+    op.drop_index('ix_incomes_user_year_date', table_name='incomes')
+    op.drop_column('incomes', 'tax_year')
+    op.add_column('incomes', sa.Column('tax_year', sa.String(length=7), sa.Computed(_tax_year_expression('date_received'), persisted=True), nullable=False))
+    op.create_index('ix_incomes_user_year_date', 'incomes', ['user_id', 'tax_year', sa.text('date_received DESC')], unique=False, postgresql_include=['amount', 'tax_saved'])
+    
+    op.drop_index('ix_expenses_user_year_date', table_name='expenses')
+    op.drop_column('expenses', 'tax_year')
+    op.add_column('expenses', sa.Column('tax_year', sa.String(length=7), sa.Computed(_tax_year_expression('date_paid'), persisted=True), nullable=False))
+    op.create_index('ix_expenses_user_year_date', 'expenses', ['user_id', 'tax_year', sa.text('date_paid DESC')], unique=False, postgresql_include=['amount'])
+
+
+def downgrade() -> None:
+    # Keeps the stored values (and the indexes) as ordinary column data
+    op.execute('ALTER TABLE expenses ALTER COLUMN tax_year DROP EXPRESSION')
+    op.execute('ALTER TABLE incomes ALTER COLUMN tax_year DROP EXPRESSION')
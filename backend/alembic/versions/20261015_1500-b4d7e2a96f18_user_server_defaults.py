@@ -0,0 +1,29 @@
+"""user_server_defaults
+
+Revision ID: b4d7e2a96f18
+Revises: 8e2f5a9c1d37
+Create Date: 2026-10-15 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4d7e2a96f18'
+down_revision = '8e2f5a9c1d37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Defaults are filled in by the database rather than sent with every insert
+    op.alter_column('users', 'uc_enabled', server_default=sa.text('false'))
+    op.alter_column('users', 'tax_set_aside_percentage', server_default=sa.text('20.00'))
+    op.alter_column('users', 'subscription_status', server_default=sa.text("'inactive'"))
+
+
+def downgrade() -> None:
+    op.alter_column('users', 'subscription_status', server_default=None)
+    op.alter_column('users', 'tax_set_aside_percentage', server_default=None)
+    op.alter_column('users', 'uc_enabled', server_default=None)
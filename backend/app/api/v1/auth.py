@@ -1,9 +1,12 @@
 """Authentication routes."""
-from fastapi import APIRouter, Depends, Form, Request, HTTPException
+from fastapi import APIRouter, Cookie, Depends, Form, Request, HTTPException
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
-from supabase import create_client, Client
+from supabase import create_client, Client, ClientOptions
+from functools import lru_cache
+from typing import Optional
+import logging
 
 from app.database import get_db
 from app.models.user import User
@@ -11,11 +14,23 @@ from app.core.config import settings
 
 router = APIRouter(tags=["auth"])
 templates = Jinja2Templates(directory="app/templates")
+logger = logging.getLogger(__name__)
 
 # Lazy initialize Supabase client
+@lru_cache(maxsize=1)
 def get_supabase() -> Client:
-    """Get Supabase client."""
-    return create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+    """
+    Get the shared Supabase client.
+    
+    Created once so its HTTP connection pool is reused across requests.
+    The client is shared between users, so it never refreshes tokens in the
+    background and logout revokes the caller's own token explicitly.
+    """
+    return create_client(
+        settings.SUPABASE_URL,
+        settings.SUPABASE_KEY,
+        options=ClientOptions(auto_refresh_token=False, persist_session=False),
+    )
 
 
 @router.get("/login", response_class=HTMLResponse)
@@ -28,7 +43,7 @@ async def login_page(request: Request, error: str = None):
 
 
 @router.post("/auth/login")
-async def login(
+def login(
     email: str = Form(...),
     password: str = Form(...),
     db: Session = Depends(get_db),
@@ -75,7 +90,7 @@ async def signup_page(request: Request, error: str = None):
 
 
 @router.post("/auth/signup")
-async def signup(
+def signup(
     full_name: str = Form(...),
     email: str = Form(...),
     password: str = Form(...),
@@ -110,11 +125,13 @@ async def signup(
 
 
 @router.get("/logout")
-async def logout():
+def logout(access_token: Optional[str] = Cookie(None)):
     """Handle logout."""
     try:
-        supabase = get_supabase()
-        supabase.auth.sign_out()
-    except:
-        pass
+        if access_token:
+            supabase = get_supabase()
+            supabase.auth.admin.sign_out(access_token)
+    except Exception:
+        # Revocation is best effort: the token still expires on its own
+        logger.warning("Failed to revoke Supabase session on logout", exc_info=True)
     return RedirectResponse(url="/login", status_code=303)
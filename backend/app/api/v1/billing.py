@@ -1,23 +1,27 @@
 """Billing and subscription endpoints."""
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 import stripe
 
 from app.database import get_db
 from app.models.user import User
 from app.core.security import get_current_user
+from app.core.cache import invalidate_user
 from app.core.config import settings
 from app.services.stripe_service import (
     create_customer,
     create_checkout_session,
     create_customer_portal_session,
+    construct_webhook_event,
+    process_stripe_event,
 )
 
 router = APIRouter(prefix="/billing", tags=["billing"])
 
 
 @router.post("/create-checkout-session")
-async def create_checkout(
+def create_checkout(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -30,6 +34,7 @@ async def create_checkout(
         )
         current_user.stripe_customer_id = customer_id
         db.commit()
+        invalidate_user(current_user.supabase_id)
     
     # Create checkout session
     checkout_url = create_checkout_session(
@@ -42,7 +47,7 @@ async def create_checkout(
 
 
 @router.post("/create-portal-session")
-async def create_portal(
+def create_portal(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -64,57 +69,30 @@ async def create_portal(
 @router.post("/webhook")
 async def stripe_webhook(
     request: Request,
-    db: Session = Depends(get_db),
 ):
     """
     Handle Stripe webhook events.
     
-    Updates subscription status based on Stripe events.
+    Updates subscription status based on Stripe events. The event is only
+    acknowledged once the update has committed, so a failure returns a 500
+    and Stripe retries it.
     """
     payload = await request.body()
     sig_header = request.headers.get("stripe-signature")
     
+    # Signature verification is CPU-bound, so keep it off the event loop
     try:
-        event = stripe.Webhook.construct_event(
-            payload, sig_header, settings.STRIPE_WEBHOOK_SECRET
-        )
+        event = await run_in_threadpool(construct_webhook_event, payload, sig_header)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid payload")
     except stripe.error.SignatureVerificationError:
         raise HTTPException(status_code=400, detail="Invalid signature")
     
-    # Handle different event types
-    if event["type"] == "checkout.session.completed":
-        session = event["data"]["object"]
-        customer_id = session["customer"]
-        subscription_id = session["subscription"]
-        
-        # Update user subscription
-        user = db.query(User).filter(User.stripe_customer_id == customer_id).first()
-        if user:
-            user.subscription_id = subscription_id
-            user.subscription_status = "active"
-            db.commit()
-    
-    elif event["type"] == "customer.subscription.updated":
-        subscription = event["data"]["object"]
-        subscription_id = subscription["id"]
-        status_value = subscription["status"]
-        
-        # Update subscription status
-        user = db.query(User).filter(User.subscription_id == subscription_id).first()
-        if user:
-            user.subscription_status = status_value
-            db.commit()
-    
-    elif event["type"] == "customer.subscription.deleted":
-        subscription = event["data"]["object"]
-        subscription_id = subscription["id"]
-        
-        # Mark subscription as canceled
-        user = db.query(User).filter(User.subscription_id == subscription_id).first()
-        if user:
-            user.subscription_status = "canceled"
-            db.commit()
+    await run_in_threadpool(
+        process_stripe_event,
+        event["id"],
+        event["type"],
+        event["data"]["object"],
+    )
     
     return {"status": "success"}
@@ -1,7 +1,10 @@
 """Expense tracking endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import insert, select, tuple_, update
+from typing import List, Optional
+from datetime import date
 from uuid import UUID
 
 from app.database import get_db
@@ -9,10 +12,17 @@ from app.models.user import User
 from app.models.expense import Expense
 from app.schemas.expense import ExpenseCreate, ExpenseUpdate, ExpenseResponse, EXPENSE_CATEGORIES
 from app.core.security import get_current_active_subscriber
-from app.core.dates import get_tax_year
+from app.core.cache import invalidate_tax_totals
 
 router = APIRouter(prefix="/expenses", tags=["expenses"])
 
+# Default and maximum number of rows returned per list page
+LIST_PAGE_SIZE = 100
+LIST_MAX_PAGE_SIZE = 500
+
+_expense_list_adapter = TypeAdapter(List[ExpenseResponse])
+_EXPENSE_LIST_COLUMNS = [getattr(Expense, name) for name in ExpenseResponse.model_fields]
+
 
 @router.get("/categories", response_model=List[str])
 async def get_expense_categories():
@@ -21,59 +31,85 @@ async def get_expense_categories():
 
 
 @router.post("/", response_model=ExpenseResponse, status_code=status.HTTP_201_CREATED)
-async def create_expense(
+def create_expense(
     expense_data: ExpenseCreate,
     current_user: User = Depends(get_current_active_subscriber),
     db: Session = Depends(get_db),
 ):
     """Create a new expense transaction."""
-    tax_year = get_tax_year(expense_data.date_paid)
-    
-    expense = Expense(
-        user_id=current_user.id,
-        date_paid=expense_data.date_paid,
-        amount=expense_data.amount,
-        category=expense_data.category,
-        description=expense_data.description,
-        tax_year=tax_year,
-    )
+    # RETURNING gives back the stored row (including the tax year the database
+    # derives from date_paid), so no refresh is needed after commit
+    expense = db.scalars(
+        insert(Expense).values(
+            user_id=current_user.id,
+            date_paid=expense_data.date_paid,
+            amount=expense_data.amount,
+            category=expense_data.category,
+            description=expense_data.description,
+        ).returning(Expense)
+    ).one()
+    response = ExpenseResponse.model_validate(expense)
     
-    db.add(expense)
     db.commit()
-    db.refresh(expense)
+    invalidate_tax_totals(current_user.id, response.tax_year)
     
-    return expense
+    return response
 
 
 @router.get("/", response_model=List[ExpenseResponse])
-async def list_expenses(
+def list_expenses(
     current_user: User = Depends(get_current_active_subscriber),
     db: Session = Depends(get_db),
     tax_year: str = None,
+    limit: int = Query(LIST_PAGE_SIZE, ge=1, le=LIST_MAX_PAGE_SIZE),
+    before: Optional[date] = None,
+    before_id: Optional[UUID] = None,
 ):
-    """List all expense transactions for current user."""
-    query = db.query(Expense).filter(Expense.user_id == current_user.id)
+    """
+    List expense transactions for current user, most recent first.
+    
+    Results are keyset-paginated: pass the date_paid and id of the last
+    row of a page as before/before_id to fetch the next page (before_id is
+    only accepted together with before).
+    """
+    if before_id and not before:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="before_id requires before",
+        )
+    
+    # Select only the response columns as plain rows, skipping ORM instances
+    stmt = select(*_EXPENSE_LIST_COLUMNS).where(Expense.user_id == current_user.id)
     
     if tax_year:
-        query = query.filter(Expense.tax_year == tax_year)
+        stmt = stmt.where(Expense.tax_year == tax_year)
+    
+    if before and before_id:
+        stmt = stmt.where(tuple_(Expense.date_paid, Expense.id) < (before, before_id))
+    elif before:
+        stmt = stmt.where(Expense.date_paid < before)
+    
+    rows = db.execute(
+        stmt.order_by(Expense.date_paid.desc(), Expense.id.desc()).limit(limit)
+    ).mappings()
     
-    expenses = query.order_by(Expense.date_paid.desc()).all()
-    return expenses
+    # Rows come straight from the database, so skip per-row validation
+    return Response(
+        content=_expense_list_adapter.dump_json([ExpenseResponse.model_construct(**row) for row in rows]),
+        media_type="application/json",
+    )
 
 
 @router.get("/{expense_id}", response_model=ExpenseResponse)
-async def get_expense(
+def get_expense(
     expense_id: UUID,
     current_user: User = Depends(get_current_active_subscriber),
     db: Session = Depends(get_db),
 ):
     """Get a specific expense transaction."""
-    expense = db.query(Expense).filter(
-        Expense.id == expense_id,
-        Expense.user_id == current_user.id,
-    ).first()
+    expense = db.get(Expense, expense_id)
     
-    if not expense:
+    if expense is None or expense.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Expense transaction not found",
@@ -83,58 +119,60 @@ async def get_expense(
 
 
 @router.patch("/{expense_id}", response_model=ExpenseResponse)
-async def update_expense(
+def update_expense(
     expense_id: UUID,
     expense_update: ExpenseUpdate,
     current_user: User = Depends(get_current_active_subscriber),
     db: Session = Depends(get_db),
 ):
     """Update an expense transaction."""
-    expense = db.query(Expense).filter(
+    update_data = expense_update.model_dump(exclude_unset=True)
+    
+    # Update and return the row in one statement; the self-join exposes the
+    # pre-update tax year so both the old and new years' totals are invalidated
+    current = select(Expense.id, Expense.tax_year).where(
         Expense.id == expense_id,
         Expense.user_id == current_user.id,
-    ).first()
+    ).subquery()
+    stmt = update(Expense).where(Expense.id == current.c.id).returning(Expense, current.c.tax_year)
+    if update_data:
+        stmt = stmt.values(**update_data)
     
-    if not expense:
+    row = db.execute(stmt, execution_options={"synchronize_session": False}).one_or_none()
+    
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Expense transaction not found",
         )
     
-    update_data = expense_update.model_dump(exclude_unset=True)
-    
-    # If date changed, recalculate tax year
-    if "date_paid" in update_data:
-        update_data["tax_year"] = get_tax_year(update_data["date_paid"])
-    
-    for field, value in update_data.items():
-        setattr(expense, field, value)
+    expense, old_tax_year = row
+    response = ExpenseResponse.model_validate(expense)
     
     db.commit()
-    db.refresh(expense)
+    invalidate_tax_totals(current_user.id, old_tax_year, response.tax_year)
     
-    return expense
+    return response
 
 
 @router.delete("/{expense_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_expense(
+def delete_expense(
     expense_id: UUID,
     current_user: User = Depends(get_current_active_subscriber),
     db: Session = Depends(get_db),
 ):
     """Delete an expense transaction."""
-    expense = db.query(Expense).filter(
-        Expense.id == expense_id,
-        Expense.user_id == current_user.id,
-    ).first()
+    expense = db.get(Expense, expense_id)
     
-    if not expense:
+    if expense is None or expense.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Expense transaction not found",
         )
     
+    tax_year = expense.tax_year
     db.delete(expense)
     db.commit()
+    invalidate_tax_totals(current_user.id, tax_year)
     
     return None
@@ -1,39 +1,82 @@
 """Data export endpoints."""
-from fastapi import APIRouter, Depends, Response
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
-import json
+from sqlalchemy import select
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List
+from uuid import UUID
 
-from app.database import get_db
+from app.database import SessionLocal
 from app.models.user import User
 from app.models.income import Income
 from app.models.expense import Expense
 from app.models.uc_report import UCReport
 from app.models.tax_snapshot import TaxSnapshot
 from app.core.security import get_current_active_subscriber
-from app.services.export import generate_transactions_csv, generate_full_export
+from app.services.export import (
+    EXPENSE_EXPORT_COLUMNS,
+    INCOME_EXPORT_COLUMNS,
+    TAX_SNAPSHOT_EXPORT_COLUMNS,
+    UC_REPORT_EXPORT_COLUMNS,
+    generate_full_export,
+    iter_transactions_csv,
+)
 
 router = APIRouter(prefix="/export", tags=["export"])
 
+# Rows fetched per round-trip when streaming exports
+EXPORT_BATCH_SIZE = 1000
+
+
+def _iter_in_batches(db: Session, stmt) -> Iterator:
+    """Lazily execute stmt and yield rows fetched in batches via a server-side cursor."""
+    yield from db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+
+def _stream_transactions_csv(user_id: UUID) -> Iterator[str]:
+    """
+    Stream a user's transactions as CSV.
+    
+    Uses its own session because the response body is produced after the
+    request's database dependency has been closed.
+    """
+    db = SessionLocal()
+    try:
+        # Only the exported columns are selected, as plain rows rather than ORM instances
+        incomes = _iter_in_batches(
+            db,
+            select(
+                Income.date_received,
+                Income.amount,
+                Income.description,
+                Income.tax_year,
+                Income.created_at,
+            ).where(Income.user_id == user_id).order_by(Income.date_received),
+        )
+        expenses = _iter_in_batches(
+            db,
+            select(
+                Expense.date_paid,
+                Expense.amount,
+                Expense.description,
+                Expense.category,
+                Expense.tax_year,
+                Expense.created_at,
+            ).where(Expense.user_id == user_id).order_by(Expense.date_paid),
+        )
+        yield from iter_transactions_csv(incomes, expenses)
+    finally:
+        db.close()
+
 
 @router.get("/csv")
-async def export_transactions_csv(
+def export_transactions_csv(
     current_user: User = Depends(get_current_active_subscriber),
-    db: Session = Depends(get_db),
 ):
     """Export all transactions as CSV."""
-    incomes = db.query(Income).filter(
-        Income.user_id == current_user.id
-    ).order_by(Income.date_received).all()
-    
-    expenses = db.query(Expense).filter(
-        Expense.user_id == current_user.id
-    ).order_by(Expense.date_paid).all()
-    
-    csv_content = generate_transactions_csv(incomes, expenses)
-    
-    return Response(
-        content=csv_content,
+    return StreamingResponse(
+        _stream_transactions_csv(current_user.id),
         media_type="text/csv",
         headers={
             "Content-Disposition": "attachment; filename=transactions.csv"
@@ -41,33 +84,43 @@ async def export_transactions_csv(
     )
 
 
+def _fetch_all(stmt) -> List[Dict[str, Any]]:
+    """
+    Run stmt on a dedicated session and return all rows as dicts.
+    
+    Each call checks out its own pooled connection so several queries can
+    run concurrently from worker threads.
+    """
+    db = SessionLocal()
+    try:
+        return [row._asdict() for row in db.execute(stmt)]
+    finally:
+        db.close()
+
+
 @router.get("/full")
-async def export_full_data(
+def export_full_data(
     current_user: User = Depends(get_current_active_subscriber),
-    db: Session = Depends(get_db),
 ):
     """
     Export complete user data (GDPR compliance).
     
     Returns all user data in JSON format.
     """
-    incomes = db.query(Income).filter(
-        Income.user_id == current_user.id
-    ).all()
-    
-    expenses = db.query(Expense).filter(
-        Expense.user_id == current_user.id
-    ).all()
+    # Only the exported columns are selected, as plain rows rather than ORM instances
+    statements = [
+        select(*INCOME_EXPORT_COLUMNS).where(Income.user_id == current_user.id),
+        select(*EXPENSE_EXPORT_COLUMNS).where(Expense.user_id == current_user.id),
+        select(*UC_REPORT_EXPORT_COLUMNS).where(UCReport.user_id == current_user.id),
+        select(*TAX_SNAPSHOT_EXPORT_COLUMNS).where(TaxSnapshot.user_id == current_user.id),
+    ]
     
-    uc_reports = db.query(UCReport).filter(
-        UCReport.user_id == current_user.id
-    ).all()
+    # The queries are independent, so overlap their round-trips
+    with ThreadPoolExecutor(max_workers=len(statements)) as executor:
+        incomes, expenses, uc_reports, tax_snapshots = executor.map(_fetch_all, statements)
     
-    tax_snapshots = db.query(TaxSnapshot).filter(
-        TaxSnapshot.user_id == current_user.id
-    ).all()
-    
-    export_data = generate_full_export(
+    # Already serialised, so FastAPI's JSON encoding is skipped
+    export_json = generate_full_export(
         current_user,
         incomes,
         expenses,
@@ -75,8 +128,9 @@ async def export_full_data(
         tax_snapshots,
     )
     
-    return JSONResponse(
-        content=export_data,
+    return Response(
+        content=export_json,
+        media_type="application/json",
         headers={
             "Content-Disposition": "attachment; filename=full_export.json"
         },
@@ -1,7 +1,10 @@
 """Income tracking endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import insert, select, tuple_, update
+from typing import List, Optional
+from datetime import date
 from uuid import UUID
 
 from app.database import get_db
@@ -10,13 +13,21 @@ from app.models.income import Income
 from app.schemas.income import IncomeCreate, IncomeUpdate, IncomeResponse
 from app.core.security import get_current_active_subscriber
 from app.core.dates import get_tax_year
-from app.core.tax_rulesets import get_ruleset_for_date
+from app.core.cache import invalidate_tax_totals
+from app.core.tax_rulesets import get_ruleset_by_tax_year
 
 router = APIRouter(prefix="/income", tags=["income"])
 
+# Default and maximum number of rows returned per list page
+LIST_PAGE_SIZE = 100
+LIST_MAX_PAGE_SIZE = 500
+
+_income_list_adapter = TypeAdapter(List[IncomeResponse])
+_INCOME_LIST_COLUMNS = [getattr(Income, name) for name in IncomeResponse.model_fields]
+
 
 @router.post("/", response_model=IncomeResponse, status_code=status.HTTP_201_CREATED)
-async def create_income(
+def create_income(
     income_data: IncomeCreate,
     current_user: User = Depends(get_current_active_subscriber),
     db: Session = Depends(get_db),
@@ -24,53 +35,80 @@ async def create_income(
     """Create a new income transaction."""
     # Determine tax year and ruleset
     tax_year = get_tax_year(income_data.date_received)
-    ruleset = get_ruleset_for_date(income_data.date_received)
-    
-    income = Income(
-        user_id=current_user.id,
-        date_received=income_data.date_received,
-        amount=income_data.amount,
-        description=income_data.description,
-        tax_year=tax_year,
-        tax_ruleset_version=ruleset["version"],
-    )
+    ruleset = get_ruleset_by_tax_year(tax_year)
+    
+    # RETURNING gives back the stored row, so no refresh is needed after commit
+    income = db.scalars(
+        insert(Income).values(
+            user_id=current_user.id,
+            date_received=income_data.date_received,
+            amount=income_data.amount,
+            description=income_data.description,
+            tax_ruleset_version=ruleset["version"],
+        ).returning(Income)
+    ).one()
+    response = IncomeResponse.model_validate(income)
     
-    db.add(income)
     db.commit()
-    db.refresh(income)
+    invalidate_tax_totals(current_user.id, tax_year)
     
-    return income
+    return response
 
 
 @router.get("/", response_model=List[IncomeResponse])
-async def list_income(
+def list_income(
     current_user: User = Depends(get_current_active_subscriber),
     db: Session = Depends(get_db),
     tax_year: str = None,
+    limit: int = Query(LIST_PAGE_SIZE, ge=1, le=LIST_MAX_PAGE_SIZE),
+    before: Optional[date] = None,
+    before_id: Optional[UUID] = None,
 ):
-    """List all income transactions for current user."""
-    query = db.query(Income).filter(Income.user_id == current_user.id)
+    """
+    List income transactions for current user, most recent first.
+    
+    Results are keyset-paginated: pass the date_received and id of the last
+    row of a page as before/before_id to fetch the next page (before_id is
+    only accepted together with before).
+    """
+    if before_id and not before:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="before_id requires before",
+        )
+    
+    # Select only the response columns as plain rows, skipping ORM instances
+    stmt = select(*_INCOME_LIST_COLUMNS).where(Income.user_id == current_user.id)
     
     if tax_year:
-        query = query.filter(Income.tax_year == tax_year)
+        stmt = stmt.where(Income.tax_year == tax_year)
     
-    incomes = query.order_by(Income.date_received.desc()).all()
-    return incomes
+    if before and before_id:
+        stmt = stmt.where(tuple_(Income.date_received, Income.id) < (before, before_id))
+    elif before:
+        stmt = stmt.where(Income.date_received < before)
+    
+    rows = db.execute(
+        stmt.order_by(Income.date_received.desc(), Income.id.desc()).limit(limit)
+    ).mappings()
+    
+    # Rows come straight from the database, so skip per-row validation
+    return Response(
+        content=_income_list_adapter.dump_json([IncomeResponse.model_construct(**row) for row in rows]),
+        media_type="application/json",
+    )
 
 
 @router.get("/{income_id}", response_model=IncomeResponse)
-async def get_income(
+def get_income(
     income_id: UUID,
     current_user: User = Depends(get_current_active_subscriber),
     db: Session = Depends(get_db),
 ):
     """Get a specific income transaction."""
-    income = db.query(Income).filter(
-        Income.id == income_id,
-        Income.user_id == current_user.id,
-    ).first()
+    income = db.get(Income, income_id)
     
-    if not income:
+    if income is None or income.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Income transaction not found",
@@ -80,61 +118,65 @@ async def get_income(
 
 
 @router.patch("/{income_id}", response_model=IncomeResponse)
-async def update_income(
+def update_income(
     income_id: UUID,
     income_update: IncomeUpdate,
     current_user: User = Depends(get_current_active_subscriber),
     db: Session = Depends(get_db),
 ):
     """Update an income transaction."""
-    income = db.query(Income).filter(
+    update_data = income_update.model_dump(exclude_unset=True)
+    
+    # If date changed, record the new tax year's ruleset (the database derives tax_year)
+    if "date_received" in update_data:
+        ruleset = get_ruleset_by_tax_year(get_tax_year(update_data["date_received"]))
+        update_data["tax_ruleset_version"] = ruleset["version"]
+    
+    # Update and return the row in one statement; the self-join exposes the
+    # pre-update tax year so both the old and new years' totals are invalidated
+    current = select(Income.id, Income.tax_year).where(
         Income.id == income_id,
         Income.user_id == current_user.id,
-    ).first()
+    ).subquery()
+    stmt = update(Income).where(Income.id == current.c.id).returning(Income, current.c.tax_year)
+    if update_data:
+        stmt = stmt.values(**update_data)
     
-    if not income:
+    row = db.execute(stmt, execution_options={"synchronize_session": False}).one_or_none()
+    
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Income transaction not found",
         )
     
-    update_data = income_update.model_dump(exclude_unset=True)
-    
-    # If date changed, recalculate tax year and ruleset
-    if "date_received" in update_data:
-        new_date = update_data["date_received"]
-        update_data["tax_year"] = get_tax_year(new_date)
-        ruleset = get_ruleset_for_date(new_date)
-        update_data["tax_ruleset_version"] = ruleset["version"]
-    
-    for field, value in update_data.items():
-        setattr(income, field, value)
+    income, old_tax_year = row
+    response = IncomeResponse.model_validate(income)
     
     db.commit()
-    db.refresh(income)
+    invalidate_tax_totals(current_user.id, old_tax_year, response.tax_year)
     
-    return income
+    return response
 
 
 @router.delete("/{income_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_income(
+def delete_income(
     income_id: UUID,
     current_user: User = Depends(get_current_active_subscriber),
     db: Session = Depends(get_db),
 ):
     """Delete an income transaction."""
-    income = db.query(Income).filter(
-        Income.id == income_id,
-        Income.user_id == current_user.id,
-    ).first()
+    income = db.get(Income, income_id)
     
-    if not income:
+    if income is None or income.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Income transaction not found",
         )
     
+    tax_year = income.tax_year
     db.delete(income)
     db.commit()
+    invalidate_tax_totals(current_user.id, tax_year)
     
     return None
@@ -1,10 +1,13 @@
 """Tax calculation and summary endpoints."""
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from typing import List
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import Date, Integer, Numeric, and_, cast, func, literal, null, select, union_all
+from typing import List, NamedTuple, Optional
+from uuid import UUID
 from datetime import date
 from decimal import Decimal
+import orjson
 
 from app.database import get_db
 from app.models.user import User
@@ -15,13 +18,175 @@ from app.schemas.tax import TaxSummary, TaxSnapshotResponse
 from app.core.security import get_current_active_subscriber
 from app.core.dates import get_current_tax_year, get_tax_year_dates, get_hmrc_registration_deadline
 from app.core.tax_calc import calculate_total_tax, calculate_tax_to_set_aside
-from app.core.tax_rulesets import get_ruleset_by_tax_year
+from app.core.tax_rulesets import get_decimal_ruleset_by_tax_year, get_ruleset_by_tax_year
+from app.core.cache import cache, tax_totals_key
 
 router = APIRouter(prefix="/tax", tags=["tax"])
 
+# Seconds a user's cached tax year totals are served before being recomputed
+TAX_TOTALS_CACHE_TTL = 300
+
+
+class TaxYearTotals(NamedTuple):
+    """Transaction aggregates for one user and tax year."""
+    total_income: Decimal
+    total_expenses: Decimal
+    net_profit: Decimal
+    actual_tax_saved: Decimal
+    first_income_date: Optional[date]
+    vat_threshold_proximity: Decimal  # Percentage towards VAT threshold
+    recent_income_count: Optional[int]  # Income received since the 1st of the current month, if counted
+
+
+def _query_tax_year_totals(
+    db: Session,
+    user_id: UUID,
+    tax_year: str,
+    vat_threshold: Decimal,
+    count_recent_income: bool = False,
+) -> TaxYearTotals:
+    """
+    Aggregate income and expense totals for a tax year in the database.
+    
+    All arithmetic, including net profit and VAT threshold proximity, is done
+    by PostgreSQL so only the final figures are converted to Decimal. The
+    dashboard's count of income received this month, which may span tax
+    years, can be fetched in the same round-trip.
+    
+    Args:
+        db: Database session
+        user_id: Owner of the transactions
+        tax_year: Tax year string (e.g., "2024-25")
+        vat_threshold: VAT registration threshold for the tax year
+        count_recent_income: Also count income received this month
+            (recent_income_count is None otherwise)
+        
+    Returns:
+        TaxYearTotals for the tax year
+    """
+    # Both aggregates are fetched in a single round-trip, keyed by "kind"
+    incomes_q = select(
+        literal("income").label("kind"),
+        func.coalesce(func.sum(Income.amount), Decimal("0.00")).label("total"),
+        func.coalesce(func.sum(Income.tax_saved), Decimal("0.00")).label("tax_saved"),
+        func.min(Income.date_received).label("first_date"),
+    ).where(
+        and_(
+            Income.user_id == user_id,
+            Income.tax_year == tax_year,
+        )
+    )
+    
+    expenses_q = select(
+        literal("expense").label("kind"),
+        func.coalesce(func.sum(Expense.amount), Decimal("0.00")).label("total"),
+        cast(null(), Numeric(10, 2)).label("tax_saved"),
+        cast(null(), Date).label("first_date"),
+    ).where(
+        and_(
+            Expense.user_id == user_id,
+            Expense.tax_year == tax_year,
+        )
+    )
+    
+    recent_q = select(
+        literal("recent").label("kind"),
+        cast(func.count(Income.id), Numeric).label("total"),
+        cast(null(), Numeric(10, 2)).label("tax_saved"),
+        cast(null(), Date).label("first_date"),
+    ).where(
+        and_(
+            Income.user_id == user_id,
+            Income.date_received >= date.today().replace(day=1),
+        )
+    )
+    
+    branches = [incomes_q, expenses_q]
+    if count_recent_income:
+        branches.append(recent_q)
+    
+    # Each branch returns exactly one row, so the outer aggregates just pick them out
+    totals = union_all(*branches).subquery()
+    total_income = func.sum(totals.c.total).filter(totals.c.kind == "income")
+    total_expenses = func.sum(totals.c.total).filter(totals.c.kind == "expense")
+    
+    row = db.execute(
+        select(
+            total_income.label("total_income"),
+            total_expenses.label("total_expenses"),
+            (total_income - total_expenses).label("net_profit"),
+            func.max(totals.c.tax_saved).label("tax_saved"),
+            func.max(totals.c.first_date).label("first_date"),
+            func.round(
+                func.coalesce(total_income / func.nullif(literal(vat_threshold, Numeric), 0) * 100, 0),
+                2,
+            ).label("vat_proximity"),
+            cast(
+                func.sum(totals.c.total).filter(totals.c.kind == "recent"), Integer
+            ).label("recent_count"),
+        )
+    ).one()
+    
+    return TaxYearTotals(
+        total_income=row.total_income,
+        total_expenses=row.total_expenses,
+        net_profit=row.net_profit,
+        actual_tax_saved=row.tax_saved,
+        first_income_date=row.first_date,
+        vat_threshold_proximity=row.vat_proximity,
+        recent_income_count=row.recent_count,
+    )
+
+
+def _get_tax_year_totals(
+    db: Session,
+    user_id: UUID,
+    tax_year: str,
+    vat_threshold: Decimal,
+    count_recent_income: bool = False,
+) -> TaxYearTotals:
+    """
+    Get income and expense totals for a tax year, served from cache when possible.
+    
+    Cached entries are invalidated whenever the user's income or expenses
+    change, and expire after TAX_TOTALS_CACHE_TTL seconds regardless (so the
+    recent income count may lag by up to that long when a new month starts).
+    Only the current tax year should count recent income: its entry is the
+    one invalidate_tax_totals() drops for every change.
+    
+    Args:
+        db: Database session
+        user_id: Owner of the transactions
+        tax_year: Tax year string (e.g., "2024-25")
+        vat_threshold: VAT registration threshold for the tax year
+        count_recent_income: Also count income received this month
+    
+    Returns:
+        TaxYearTotals for the tax year
+    """
+    key = tax_totals_key(user_id, tax_year)
+    cached = cache.get(key)
+    if cached is not None:
+        totals = TaxYearTotals(*orjson.loads(cached))
+        return totals._replace(
+            total_income=Decimal(totals.total_income),
+            total_expenses=Decimal(totals.total_expenses),
+            net_profit=Decimal(totals.net_profit),
+            actual_tax_saved=Decimal(totals.actual_tax_saved),
+            first_income_date=(
+                date.fromisoformat(totals.first_income_date) if totals.first_income_date else None
+            ),
+            vat_threshold_proximity=Decimal(totals.vat_threshold_proximity),
+        )
+    
+    totals = _query_tax_year_totals(db, user_id, tax_year, vat_threshold, count_recent_income)
+    cache.set(key, orjson.dumps(list(totals), default=str), TAX_TOTALS_CACHE_TTL)
+    
+    return totals
+
 
 @router.get("/summary", response_model=TaxSummary)
-async def get_tax_summary(
+def get_tax_summary(
     current_user: User = Depends(get_current_active_subscriber),
     db: Session = Depends(get_db),
     tax_year: str = None,
@@ -31,41 +196,28 @@ async def get_tax_summary(
     
     Calculates in real-time based on transactions.
     """
+    current_tax_year = get_current_tax_year()
     if not tax_year:
-        tax_year = get_current_tax_year()
+        tax_year = current_tax_year
     
     tax_year_start, tax_year_end = get_tax_year_dates(tax_year)
     
-    # Get all income for this tax year
-    incomes = db.query(Income).filter(
-        and_(
-            Income.user_id == current_user.id,
-            Income.tax_year == tax_year,
-        )
-    ).all()
-    
-    # Get all expenses for this tax year
-    expenses = db.query(Expense).filter(
-        and_(
-            Expense.user_id == current_user.id,
-            Expense.tax_year == tax_year,
-        )
-    ).all()
-    
-    total_income = sum((i.amount for i in incomes), Decimal("0.00"))
-    total_expenses = sum((e.amount for e in expenses), Decimal("0.00"))
-    net_profit = total_income - total_expenses
+    vat_threshold = get_decimal_ruleset_by_tax_year(tax_year)["vat_threshold"]
     
-    # Calculate actual tax saved
-    actual_tax_saved = sum((i.tax_saved for i in incomes if i.tax_saved), Decimal("0.00"))
+    # Sum income, expenses and tax saved for this tax year (plus this
+    # month's income count, which only belongs with the current one)
+    totals = _get_tax_year_totals(
+        db, current_user.id, tax_year, vat_threshold,
+        count_recent_income=tax_year == current_tax_year,
+    )
     
     # Calculate tax using first transaction date or tax year start
-    calc_date = incomes[0].date_received if incomes else tax_year_start
-    tax_breakdown = calculate_total_tax(net_profit, calc_date)
+    calc_date = totals.first_income_date or tax_year_start
+    tax_breakdown = calculate_total_tax(totals.net_profit, calc_date)
     
     # Calculate tax to set aside based on user's percentage (recommended)
     tax_to_set_aside = calculate_tax_to_set_aside(
-        total_income,
+        totals.total_income,
         current_user.tax_set_aside_percentage,
     )
     
@@ -74,31 +226,35 @@ async def get_tax_summary(
     if current_user.trading_start_date:
         hmrc_deadline = get_hmrc_registration_deadline(current_user.trading_start_date)
     
-    # Calculate VAT threshold proximity
-    ruleset = get_ruleset_by_tax_year(tax_year)
-    vat_threshold = Decimal(str(ruleset["vat_threshold"]))
-    vat_proximity = (total_income / vat_threshold * 100) if vat_threshold > 0 else Decimal("0.00")
-    
     return TaxSummary(
         tax_year=tax_year,
         tax_year_start=tax_year_start,
         tax_year_end=tax_year_end,
-        total_income=total_income,
-        total_expenses=total_expenses,
-        net_profit=net_profit,
-        income_tax=Decimal(str(tax_breakdown["income_tax"])),
-        ni_class2=Decimal(str(tax_breakdown["ni_class2"])),
-        ni_class4=Decimal(str(tax_breakdown["ni_class4"])),
-        total_tax=Decimal(str(tax_breakdown["total_tax"])),
+        total_income=totals.total_income,
+        total_expenses=totals.total_expenses,
+        net_profit=totals.net_profit,
+        income_tax=tax_breakdown["income_tax"],
+        ni_class2=tax_breakdown["ni_class2"],
+        ni_class4=tax_breakdown["ni_class4"],
+        total_tax=tax_breakdown["total_tax"],
         tax_to_set_aside=tax_to_set_aside,
-        actual_tax_saved=actual_tax_saved,
+        actual_tax_saved=totals.actual_tax_saved,
         hmrc_registration_deadline=hmrc_deadline,
-        vat_threshold_proximity=vat_proximity,
+        vat_threshold_proximity=totals.vat_threshold_proximity,
+        recent_income_count=totals.recent_income_count,
+    )
+
+
+def _snapshot_exists_error() -> HTTPException:
+    """Error raised when a tax year already has a snapshot."""
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Snapshot already exists for this tax year",
     )
 
 
 @router.post("/snapshots", response_model=TaxSnapshotResponse, status_code=status.HTTP_201_CREATED)
-async def create_tax_snapshot(
+def create_tax_snapshot(
     tax_year: str,
     current_user: User = Depends(get_current_active_subscriber),
     db: Session = Depends(get_db),
@@ -110,72 +266,66 @@ async def create_tax_snapshot(
     """
     tax_year_start, tax_year_end = get_tax_year_dates(tax_year)
     
-    # Check if snapshot already exists
-    existing = db.query(TaxSnapshot).filter(
-        and_(
-            TaxSnapshot.user_id == current_user.id,
-            TaxSnapshot.tax_year == tax_year,
+    # Reject early, before aggregating transactions, if a snapshot already exists
+    exists = db.scalar(
+        select(
+            select(TaxSnapshot.id).where(
+                and_(
+                    TaxSnapshot.user_id == current_user.id,
+                    TaxSnapshot.tax_year == tax_year,
+                )
+            ).exists()
         )
-    ).first()
+    )
     
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Snapshot already exists for this tax year",
-        )
+    if exists:
+        raise _snapshot_exists_error()
     
-    # Get transactions
-    incomes = db.query(Income).filter(
-        and_(
-            Income.user_id == current_user.id,
-            Income.tax_year == tax_year,
-        )
-    ).all()
-    
-    expenses = db.query(Expense).filter(
-        and_(
-            Expense.user_id == current_user.id,
-            Expense.tax_year == tax_year,
-        )
-    ).all()
+    # Get ruleset
+    ruleset = get_ruleset_by_tax_year(tax_year)
     
-    total_income = sum((i.amount for i in incomes), Decimal("0.00"))
-    total_expenses = sum((e.amount for e in expenses), Decimal("0.00"))
-    net_profit = total_income - total_expenses
+    # Get transaction totals (uncached: snapshots are an audit record)
+    totals = _query_tax_year_totals(
+        db, current_user.id, tax_year, get_decimal_ruleset_by_tax_year(tax_year)["vat_threshold"]
+    )
     
     # Calculate tax
-    calc_date = incomes[0].date_received if incomes else tax_year_start
-    tax_breakdown = calculate_total_tax(net_profit, calc_date)
+    calc_date = totals.first_income_date or tax_year_start
+    tax_breakdown = calculate_total_tax(totals.net_profit, calc_date)
     
-    # Get ruleset
-    ruleset = get_ruleset_by_tax_year(tax_year)
-    
-    # Create snapshot
-    snapshot = TaxSnapshot(
+    # Create snapshot; the unique (user_id, tax_year) index settles concurrent requests
+    stmt = insert(TaxSnapshot).values(
         user_id=current_user.id,
         tax_year=tax_year,
         tax_year_start=tax_year_start,
         tax_year_end=tax_year_end,
-        total_income=total_income,
-        total_expenses=total_expenses,
-        net_profit=net_profit,
-        income_tax=Decimal(str(tax_breakdown["income_tax"])),
-        ni_class2=Decimal(str(tax_breakdown["ni_class2"])),
-        ni_class4=Decimal(str(tax_breakdown["ni_class4"])),
-        total_tax=Decimal(str(tax_breakdown["total_tax"])),
+        total_income=totals.total_income,
+        total_expenses=totals.total_expenses,
+        net_profit=totals.net_profit,
+        income_tax=tax_breakdown["income_tax"],
+        ni_class2=tax_breakdown["ni_class2"],
+        ni_class4=tax_breakdown["ni_class4"],
+        total_tax=tax_breakdown["total_tax"],
         tax_ruleset_version=ruleset["version"],
         ruleset_data=ruleset,
-    )
+    ).on_conflict_do_nothing(
+        index_elements=[TaxSnapshot.user_id, TaxSnapshot.tax_year],
+    ).returning(TaxSnapshot)
+    
+    snapshot = db.scalar(stmt)
+    if snapshot is None:
+        db.rollback()
+        raise _snapshot_exists_error()
     
-    db.add(snapshot)
+    # Build the response before commit expires the returned row
+    response = TaxSnapshotResponse.model_validate(snapshot)
     db.commit()
-    db.refresh(snapshot)
     
-    return snapshot
+    return response
 
 
 @router.get("/snapshots", response_model=List[TaxSnapshotResponse])
-async def list_tax_snapshots(
+def list_tax_snapshots(
     current_user: User = Depends(get_current_active_subscriber),
     db: Session = Depends(get_db),
 ):
@@ -1,25 +1,27 @@
 """Universal Credit reporting endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, literal, select, true, update
 from typing import List
 from datetime import date
-from decimal import Decimal
 
 from app.database import get_db
 from app.models.user import User
-from app.models.income import Income
-from app.models.expense import Expense
 from app.models.uc_report import UCReport
 from app.schemas.uc_report import UCPeriodSummary, UCReportResponse, UCReportMarkReported
 from app.core.security import get_current_active_subscriber, require_uc_enabled
 from app.core.dates import get_uc_assessment_period, get_next_uc_assessment_period
+from app.services.uc_reports import generate_uc_reports_bulk, period_totals
 
 router = APIRouter(prefix="/uc", tags=["universal-credit"])
 
+_uc_report_list_adapter = TypeAdapter(List[UCReportResponse])
+_UC_REPORT_LIST_COLUMNS = [getattr(UCReport, name) for name in UCReportResponse.model_fields]
+
 
 @router.get("/current-period", response_model=UCPeriodSummary)
-async def get_current_uc_period(
+def get_current_uc_period(
     current_user: User = Depends(require_uc_enabled),
     db: Session = Depends(get_db),
 ):
@@ -36,63 +38,63 @@ async def get_current_uc_period(
         current_user.uc_assessment_day,
     )
     
-    # Calculate totals for this period
-    total_income = db.query(Income).filter(
-        and_(
-            Income.user_id == current_user.id,
-            Income.date_received >= period_start,
-            Income.date_received <= period_end,
-        )
-    ).with_entities(Income.amount).all()
-    
-    total_expenses = db.query(Expense).filter(
-        and_(
-            Expense.user_id == current_user.id,
-            Expense.date_paid >= period_start,
-            Expense.date_paid <= period_end,
-        )
-    ).with_entities(Expense.amount).all()
+    # Calculate totals for this period and check if already reported, in one query
+    income_sum, expense_sum = period_totals(current_user.id, period_start, period_end)
     
-    income_sum = sum((i[0] for i in total_income), Decimal("0.00"))
-    expense_sum = sum((e[0] for e in total_expenses), Decimal("0.00"))
-    net_profit = income_sum - expense_sum
-    
-    # Check if already reported
-    existing_report = db.query(UCReport).filter(
+    existing_report = select(UCReport.reported_at, UCReport.notes).where(
         and_(
             UCReport.user_id == current_user.id,
             UCReport.period_start == period_start,
             UCReport.period_end == period_end,
         )
-    ).first()
+    ).limit(1).subquery()
+    
+    # LEFT JOIN the report onto a single row so the totals come back even when none exists
+    row = db.execute(
+        select(
+            income_sum.label("total_income"),
+            expense_sum.label("total_expenses"),
+            existing_report.c.reported_at,
+            existing_report.c.notes,
+        ).select_from(
+            select(literal(1)).subquery().outerjoin(existing_report, true())
+        )
+    ).one()
     
     return UCPeriodSummary(
         period_start=period_start,
         period_end=period_end,
-        total_income=income_sum,
-        total_expenses=expense_sum,
-        net_profit=net_profit,
-        reported_at=existing_report.reported_at if existing_report else None,
-        notes=existing_report.notes if existing_report else None,
+        total_income=row.total_income,
+        total_expenses=row.total_expenses,
+        net_profit=row.total_income - row.total_expenses,
+        reported_at=row.reported_at,
+        notes=row.notes,
     )
 
 
 @router.get("/periods", response_model=List[UCReportResponse])
-async def list_uc_periods(
+def list_uc_periods(
     current_user: User = Depends(require_uc_enabled),
     db: Session = Depends(get_db),
     limit: int = 12,
 ):
     """List recent UC assessment periods."""
-    reports = db.query(UCReport).filter(
-        UCReport.user_id == current_user.id
-    ).order_by(UCReport.period_start.desc()).limit(limit).all()
-    
-    return reports
+    # Select only the response columns as plain rows, skipping ORM instances
+    rows = db.execute(
+        select(*_UC_REPORT_LIST_COLUMNS).where(
+            UCReport.user_id == current_user.id
+        ).order_by(UCReport.period_start.desc()).limit(limit)
+    ).mappings()
+    
+    # Rows come straight from the database, so skip per-row validation
+    return Response(
+        content=_uc_report_list_adapter.dump_json([UCReportResponse.model_construct(**row) for row in rows]),
+        media_type="application/json",
+    )
 
 
 @router.post("/periods/generate", response_model=UCReportResponse, status_code=status.HTTP_201_CREATED)
-async def generate_uc_report(
+def generate_uc_report(
     period_start_date: date,
     current_user: User = Depends(require_uc_enabled),
     db: Session = Depends(get_db),
@@ -108,78 +110,46 @@ async def generate_uc_report(
             detail="UC assessment day not configured",
         )
     
-    # Get period dates
-    period_start, period_end = get_uc_assessment_period(
-        period_start_date,
+    reports = generate_uc_reports_bulk(
+        db,
+        current_user.id,
         current_user.uc_assessment_day,
+        [period_start_date],
     )
     
-    # Check if report already exists
-    existing = db.query(UCReport).filter(
-        and_(
-            UCReport.user_id == current_user.id,
-            UCReport.period_start == period_start,
-        )
-    ).first()
-    
-    if existing:
+    if not reports:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Report already exists for this period",
         )
     
-    # Calculate totals
-    total_income = db.query(Income).filter(
-        and_(
-            Income.user_id == current_user.id,
-            Income.date_received >= period_start,
-            Income.date_received <= period_end,
-        )
-    ).with_entities(Income.amount).all()
-    
-    total_expenses = db.query(Expense).filter(
-        and_(
-            Expense.user_id == current_user.id,
-            Expense.date_paid >= period_start,
-            Expense.date_paid <= period_end,
-        )
-    ).with_entities(Expense.amount).all()
-    
-    income_sum = sum((i[0] for i in total_income), Decimal("0.00"))
-    expense_sum = sum((e[0] for e in total_expenses), Decimal("0.00"))
-    net_profit = income_sum - expense_sum
-    
-    # Create report
-    report = UCReport(
-        user_id=current_user.id,
-        period_start=period_start,
-        period_end=period_end,
-        total_income=income_sum,
-        total_expenses=expense_sum,
-        net_profit=net_profit,
-    )
-    
-    db.add(report)
+    response = UCReportResponse.model_validate(reports[0])
     db.commit()
-    db.refresh(report)
     
-    return report
+    return response
 
 
 @router.patch("/periods/{period_start}/mark-reported", response_model=UCReportResponse)
-async def mark_uc_period_reported(
+def mark_uc_period_reported(
     period_start: date,
     mark_data: UCReportMarkReported,
     current_user: User = Depends(require_uc_enabled),
     db: Session = Depends(get_db),
 ):
     """Mark a UC period as reported to Universal Credit."""
-    report = db.query(UCReport).filter(
-        and_(
-            UCReport.user_id == current_user.id,
-            UCReport.period_start == period_start,
-        )
-    ).first()
+    # Update and return the report in one statement instead of load, update, refresh
+    report = db.scalars(
+        update(UCReport).where(
+            and_(
+                UCReport.user_id == current_user.id,
+                UCReport.period_start == period_start,
+            )
+        ).values(
+            reported_at=mark_data.reported_at,
+            notes=mark_data.notes,
+        ).returning(UCReport),
+        execution_options={"synchronize_session": False},
+    ).one_or_none()
     
     if not report:
         raise HTTPException(
@@ -187,10 +157,7 @@ async def mark_uc_period_reported(
             detail="UC report not found for this period",
         )
     
-    report.reported_at = mark_data.reported_at
-    report.notes = mark_data.notes
-    
+    response = UCReportResponse.model_validate(report)
     db.commit()
-    db.refresh(report)
     
-    return report
+    return response
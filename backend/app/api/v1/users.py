@@ -1,17 +1,21 @@
 """User management endpoints."""
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserProfile
 from app.core.security import get_current_user, get_current_active_subscriber
+from app.core.cache import invalidate_user
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+_USER_PROFILE_COLUMNS = [getattr(User, name) for name in UserProfile.model_fields]
+
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def create_user(
+def create_user(
     user_data: UserCreate,
     db: Session = Depends(get_db),
 ):
@@ -28,18 +32,19 @@ async def create_user(
             detail="User already exists",
         )
     
-    # Create user
-    user = User(
-        supabase_id=user_data.supabase_id,
-        email=user_data.email,
-        full_name=user_data.full_name,
-    )
+    # Create user; RETURNING gives back the stored row, so no refresh is needed
+    user = db.scalars(
+        insert(User).values(
+            supabase_id=user_data.supabase_id,
+            email=user_data.email,
+            full_name=user_data.full_name,
+        ).returning(User)
+    ).one()
+    response = UserResponse.model_validate(user)
     
-    db.add(user)
     db.commit()
-    db.refresh(user)
     
-    return user
+    return response
 
 
 @router.get("/me", response_model=UserProfile)
@@ -51,7 +56,7 @@ async def get_current_user_profile(
 
 
 @router.patch("/me", response_model=UserProfile)
-async def update_current_user(
+def update_current_user(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -68,18 +73,22 @@ async def update_current_user(
                     detail="uc_assessment_day required when enabling UC",
                 )
     
-    # Apply updates
-    for field, value in update_data.items():
-        setattr(current_user, field, value)
+    # Update only the submitted columns and return the stored row in one statement
+    stmt = update(User).where(User.id == current_user.id).returning(*_USER_PROFILE_COLUMNS)
+    if update_data:
+        stmt = stmt.values(**update_data)
+    
+    row = db.execute(stmt).mappings().one()
+    response = UserProfile.model_validate(dict(row))
     
     db.commit()
-    db.refresh(current_user)
+    invalidate_user(current_user.supabase_id)
     
-    return current_user
+    return response
 
 
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_current_user(
+def delete_current_user(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -90,5 +99,6 @@ async def delete_current_user(
     """
     db.delete(current_user)
     db.commit()
+    invalidate_user(current_user.supabase_id)
     
     return None
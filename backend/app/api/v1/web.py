@@ -1,11 +1,15 @@
 """Web UI routes."""
-from fastapi import APIRouter, Depends, Request, Form, HTTPException
+from fastapi import APIRouter, Depends, Request, Form, HTTPException, Query
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from dataclasses import dataclass
 from datetime import date, timedelta
 from decimal import Decimal
+from typing import Any, Callable, Dict, Optional
+import orjson
 
 from app.database import get_db
 from app.models.user import User
@@ -14,14 +18,72 @@ from app.models.expense import Expense
 from app.models.uc_report import UCReport
 from app.core.security import get_current_user, get_current_active_subscriber
 from app.core.dates import get_tax_year, get_uc_assessment_period, get_hmrc_registration_deadline
-from app.core.tax_calc import calculate_total_tax, calculate_tax_to_set_aside
+from app.core.cache import cache, invalidate_tax_totals, invalidate_user, recommendation_key
+from app.core.tax_rulesets import get_ruleset_by_tax_year
+from app.core.tax_calc import (
+    calculate_total_tax,
+    calculate_tax_to_set_aside,
+    recommend_tax_set_aside_percentage,
+)
 from app.schemas.expense import EXPENSE_CATEGORIES
+from app.schemas.tax import TaxSummary
+from app.schemas.uc_report import UCPeriodSummary
+from app.services.totals import get_transaction_totals
+from app.services.uc_reports import period_totals
 from app.api.v1.tax import get_tax_summary as get_tax_summary_data
 from app.api.v1.uc import get_current_uc_period as get_uc_period_data
 
 router = APIRouter(tags=["web"])
 templates = Jinja2Templates(directory="app/templates")
 
+# Transaction list pages
+WEB_PAGE_SIZE = 50
+WEB_MAX_PAGE_SIZE = 200
+
+# Seconds a user's set-aside recommendation is served before being recomputed
+RECOMMENDATION_CACHE_TTL = 3600
+
+
+@dataclass(slots=True)
+class DashboardContext:
+    """Data rendered by dashboard.html, passed to the template as ctx."""
+    tax_summary: TaxSummary
+    uc_period: Optional[UCPeriodSummary]
+    days_until_hmrc_deadline: Optional[int]
+    recent_income_count: int
+    recommended_percentage: int
+    recommendation_reason: str
+    next_actions_exist: bool
+
+
+def _get_recommendation(user_id, load_profit: Callable[[], Decimal]) -> Dict[str, Any]:
+    """
+    Get a user's set-aside recommendation for all-time profit, cached per day.
+    
+    Entries are dropped whenever the user's transactions change, so
+    load_profit is only called on a cache miss. Only worth using where
+    that skips the totals query: recommend_tax_set_aside_percentage is
+    itself memoised, so pages that already have the profit call it directly.
+    
+    Args:
+        user_id: Owner of the transactions
+        load_profit: Returns the user's all-time net profit
+    
+    Returns:
+        Recommendation from recommend_tax_set_aside_percentage
+    """
+    today = date.today()
+    key = recommendation_key(user_id, today)
+    
+    cached = cache.get(key)
+    if cached is not None:
+        return orjson.loads(cached)
+    
+    recommendation = recommend_tax_set_aside_percentage(load_profit(), today)
+    cache.set(key, orjson.dumps(recommendation), RECOMMENDATION_CACHE_TTL)
+    
+    return recommendation
+
 
 @router.get("/", response_class=HTMLResponse)
 async def root():
@@ -30,20 +92,20 @@ async def root():
 
 
 @router.get("/dashboard", response_class=HTMLResponse)
-async def dashboard(
+def dashboard(
     request: Request,
     current_user: User = Depends(get_current_active_subscriber),
     db: Session = Depends(get_db),
 ):
     """Dashboard view."""
     # Get tax summary
-    tax_summary = await get_tax_summary_data(current_user, db)
+    tax_summary = get_tax_summary_data(current_user, db)
     
     # Get UC period if enabled
     uc_period = None
     if current_user.uc_enabled and current_user.uc_assessment_day:
         try:
-            uc_period = await get_uc_period_data(current_user, db)
+            uc_period = get_uc_period_data(current_user, db)
         except:
             pass
     
@@ -53,18 +115,13 @@ async def dashboard(
         deadline = get_hmrc_registration_deadline(current_user.trading_start_date)
         days_until_hmrc_deadline = (deadline - date.today()).days
     
-    # Count recent income
-    recent_income_count = db.query(Income).filter(
-        and_(
-            Income.user_id == current_user.id,
-            Income.date_received >= date.today().replace(day=1)
-        )
-    ).count()
+    # Count recent income (fetched with the tax summary totals)
+    recent_income_count = tax_summary.recent_income_count
     
-    # Calculate recommended tax percentage
-    from app.core.tax_calc import recommend_tax_set_aside_percentage
+    # Calculate recommended tax percentage (from the summary's tax year
+    # profit, which is already loaded, so there is no query to cache away)
     recommendation = recommend_tax_set_aside_percentage(
-        Decimal(str(tax_summary.net_profit)),
+        tax_summary.net_profit,
         date.today()
     )
     
@@ -78,45 +135,59 @@ async def dashboard(
         (recommendation["recommended_percentage"] > current_user.tax_set_aside_percentage)
     )
     
+    ctx = DashboardContext(
+        tax_summary=tax_summary,
+        uc_period=uc_period,
+        days_until_hmrc_deadline=days_until_hmrc_deadline,
+        recent_income_count=recent_income_count,
+        recommended_percentage=recommendation["recommended_percentage"],
+        recommendation_reason=recommendation["reason"],
+        next_actions_exist=bool(next_actions_exist),
+    )
+    
     return templates.TemplateResponse("dashboard.html", {
         "request": request,
         "user": current_user,
         "active_page": "dashboard",
-        "tax_summary": tax_summary,
-        "uc_period": uc_period,
-        "days_until_hmrc_deadline": days_until_hmrc_deadline,
-        "recent_income_count": recent_income_count,
-        "recommended_percentage": recommendation["recommended_percentage"],
-        "recommendation_reason": recommendation["reason"],
-        "next_actions_exist": next_actions_exist,
+        "ctx": ctx,
     })
 
 
 @router.get("/income", response_class=HTMLResponse)
-async def income_page(
+def income_page(
     request: Request,
     added_amount: float = None,
     save_amount: float = None,
+    page: int = Query(0, ge=0),
+    page_size: int = Query(WEB_PAGE_SIZE, ge=1, le=WEB_MAX_PAGE_SIZE),
     current_user: User = Depends(get_current_active_subscriber),
     db: Session = Depends(get_db),
 ):
     """Income tracking page."""
+    # Fetch one extra row to know whether an older page exists
     incomes = db.query(Income).filter(
         Income.user_id == current_user.id
-    ).order_by(Income.date_received.desc()).all()
+    ).order_by(
+        Income.date_received.desc(), Income.id.desc()
+    ).limit(page_size + 1).offset(page * page_size).all()
     
-    total_income = sum((i.amount for i in incomes), Decimal("0.00"))
-    last_income_amount = incomes[0].amount if incomes else None
+    has_next_page = len(incomes) > page_size
+    incomes = incomes[:page_size]
     
-    # Calculate recommended tax percentage based on current year's profit
-    from app.core.tax_calc import recommend_tax_set_aside_percentage
-    total_expenses = db.query(func.sum(Expense.amount)).filter(
-        Expense.user_id == current_user.id
-    ).scalar() or Decimal("0.00")
+    total_income, total_expenses = get_transaction_totals(db, current_user.id)
     
-    projected_profit = total_income - total_expenses
+    if page == 0:
+        last_income_amount = incomes[0].amount if incomes else None
+    else:
+        last_income_amount = db.query(Income.amount).filter(
+            Income.user_id == current_user.id
+        ).order_by(
+            Income.date_received.desc(), Income.id.desc()
+        ).limit(1).scalar()
+    
+    # Calculate recommended tax percentage based on current year's profit
     recommendation = recommend_tax_set_aside_percentage(
-        projected_profit,
+        total_income - total_expenses,
         date.today()
     )
     
@@ -125,6 +196,9 @@ async def income_page(
         "user": current_user,
         "active_page": "income",
         "incomes": incomes,
+        "page": page,
+        "page_size": page_size,
+        "has_next_page": has_next_page,
         "total_income": total_income,
         "last_income_amount": last_income_amount,
         "today": date.today().isoformat(),
@@ -136,7 +210,7 @@ async def income_page(
 
 
 @router.post("/income/add")
-async def add_income(
+def add_income(
     date_received: date = Form(...),
     amount: Decimal = Form(...),
     description: str = Form(...),
@@ -145,10 +219,8 @@ async def add_income(
     db: Session = Depends(get_db),
 ):
     """Add income transaction."""
-    from app.core.tax_rulesets import get_ruleset_for_date
-    
     tax_year = get_tax_year(date_received)
-    ruleset = get_ruleset_for_date(date_received)
+    ruleset = get_ruleset_by_tax_year(tax_year)
     
     income = Income(
         user_id=current_user.id,
@@ -156,17 +228,17 @@ async def add_income(
         amount=amount,
         description=description,
         tax_saved=tax_saved if tax_saved and tax_saved > 0 else None,
-        tax_year=tax_year,
         tax_ruleset_version=ruleset["version"],
     )
     
     db.add(income)
     db.commit()
+    invalidate_tax_totals(current_user.id, tax_year)
     
     # Calculate amount to save for this payment
     amount_to_save = calculate_tax_to_set_aside(
         amount,
-        Decimal(str(current_user.tax_set_aside_percentage))
+        current_user.tax_set_aside_percentage
     )
     
     return RedirectResponse(
@@ -176,7 +248,7 @@ async def add_income(
 
 
 @router.post("/income/update-savings/{income_id}")
-async def update_income_savings(
+def update_income_savings(
     income_id: str,
     tax_saved: Decimal = Form(...),
     current_user: User = Depends(get_current_active_subscriber),
@@ -191,12 +263,13 @@ async def update_income_savings(
     if income:
         income.tax_saved = tax_saved if tax_saved > 0 else None
         db.commit()
+        invalidate_tax_totals(current_user.id, income.tax_year)
     
     return RedirectResponse(url="/income", status_code=303)
 
 
 @router.post("/income/delete/{income_id}")
-async def delete_income(
+def delete_income(
     income_id: str,
     current_user: User = Depends(get_current_active_subscriber),
     db: Session = Depends(get_db),
@@ -208,30 +281,45 @@ async def delete_income(
     ).first()
     
     if income:
+        tax_year = income.tax_year
         db.delete(income)
         db.commit()
+        invalidate_tax_totals(current_user.id, tax_year)
     
     return RedirectResponse(url="/income", status_code=303)
 
 
 @router.get("/expenses", response_class=HTMLResponse)
-async def expenses_page(
+def expenses_page(
     request: Request,
+    page: int = Query(0, ge=0),
+    page_size: int = Query(WEB_PAGE_SIZE, ge=1, le=WEB_MAX_PAGE_SIZE),
     current_user: User = Depends(get_current_active_subscriber),
     db: Session = Depends(get_db),
 ):
     """Expenses tracking page."""
+    # Fetch one extra row to know whether an older page exists
     expenses = db.query(Expense).filter(
         Expense.user_id == current_user.id
-    ).order_by(Expense.date_paid.desc()).all()
+    ).order_by(
+        Expense.date_paid.desc(), Expense.id.desc()
+    ).limit(page_size + 1).offset(page * page_size).all()
     
-    total_expenses = sum((e.amount for e in expenses), Decimal("0.00"))
+    has_next_page = len(expenses) > page_size
+    expenses = expenses[:page_size]
+    
+    total_expenses = db.query(
+        func.coalesce(func.sum(Expense.amount), Decimal("0.00"))
+    ).filter(Expense.user_id == current_user.id).scalar()
     
     return templates.TemplateResponse("expenses.html", {
         "request": request,
         "user": current_user,
         "active_page": "expenses",
         "expenses": expenses,
+        "page": page,
+        "page_size": page_size,
+        "has_next_page": has_next_page,
         "total_expenses": total_expenses,
         "categories": EXPENSE_CATEGORIES,
         "today": date.today().isoformat(),
@@ -239,7 +327,7 @@ async def expenses_page(
 
 
 @router.post("/expenses/add")
-async def add_expense(
+def add_expense(
     date_paid: date = Form(...),
     amount: Decimal = Form(...),
     category: str = Form(...),
@@ -256,17 +344,17 @@ async def add_expense(
         amount=amount,
         category=category,
         description=description,
-        tax_year=tax_year,
     )
     
     db.add(expense)
     db.commit()
+    invalidate_tax_totals(current_user.id, tax_year)
     
     return RedirectResponse(url="/expenses", status_code=303)
 
 
 @router.post("/expenses/delete/{expense_id}")
-async def delete_expense(
+def delete_expense(
     expense_id: str,
     current_user: User = Depends(get_current_active_subscriber),
     db: Session = Depends(get_db),
@@ -278,22 +366,22 @@ async def delete_expense(
     ).first()
     
     if expense:
+        tax_year = expense.tax_year
         db.delete(expense)
         db.commit()
+        invalidate_tax_totals(current_user.id, tax_year)
     
     return RedirectResponse(url="/expenses", status_code=303)
 
 
 @router.get("/tax", response_class=HTMLResponse)
-async def tax_page(
+def tax_page(
     request: Request,
     current_user: User = Depends(get_current_active_subscriber),
     db: Session = Depends(get_db),
 ):
     """Tax summary page."""
-    from app.core.tax_calc import recommend_tax_set_aside_percentage
-    
-    tax_summary = await get_tax_summary_data(current_user, db)
+    tax_summary = get_tax_summary_data(current_user, db)
     
     days_until_hmrc_deadline = None
     if current_user.trading_start_date:
@@ -302,7 +390,7 @@ async def tax_page(
     
     # Get recommendation
     recommendation = recommend_tax_set_aside_percentage(
-        Decimal(str(tax_summary.net_profit)),
+        tax_summary.net_profit,
         date.today()
     )
     
@@ -318,18 +406,16 @@ async def tax_page(
 
 
 @router.post("/tax/add-savings")
-async def add_tax_savings(
+def add_tax_savings(
     amount: Decimal = Form(...),
     date_saved: date = Form(...),
     current_user: User = Depends(get_current_active_subscriber),
     db: Session = Depends(get_db),
 ):
     """Record a standalone tax savings transfer."""
-    from app.core.tax_rulesets import get_ruleset_for_date
-    
     # Create a zero-amount income entry just to track the savings
     tax_year = get_tax_year(date_saved)
-    ruleset = get_ruleset_for_date(date_saved)
+    ruleset = get_ruleset_by_tax_year(tax_year)
     
     # Find the most recent income to attach this to, or create a placeholder
     recent_income = db.query(Income).filter(
@@ -341,6 +427,7 @@ async def add_tax_savings(
         # Attach to existing income
         recent_income.tax_saved = (recent_income.tax_saved or Decimal("0")) + amount
         db.commit()
+        invalidate_tax_totals(current_user.id, recent_income.tax_year)
     else:
         # Create a placeholder "savings transfer" entry
         income = Income(
@@ -349,17 +436,17 @@ async def add_tax_savings(
             amount=Decimal("0"),
             description="Tax Savings Transfer",
             tax_saved=amount,
-            tax_year=tax_year,
             tax_ruleset_version=ruleset["version"],
         )
         db.add(income)
         db.commit()
+        invalidate_tax_totals(current_user.id, tax_year)
     
     return RedirectResponse(url="/tax", status_code=303)
 
 
 @router.get("/uc", response_class=HTMLResponse)
-async def uc_page(
+def uc_page(
     request: Request,
     current_user: User = Depends(get_current_active_subscriber),
     db: Session = Depends(get_db),
@@ -368,13 +455,46 @@ async def uc_page(
     if not current_user.uc_enabled:
         return RedirectResponse(url="/dashboard")
     
-    # Get current period
-    current_period = await get_uc_period_data(current_user, db)
+    current_period = None
+    previous_periods = []
     
-    # Get previous periods
-    previous_periods = db.query(UCReport).filter(
-        UCReport.user_id == current_user.id
-    ).order_by(UCReport.period_start.desc()).limit(12).all()
+    if current_user.uc_assessment_day:
+        period_start, period_end = get_uc_assessment_period(
+            date.today(),
+            current_user.uc_assessment_day,
+        )
+        
+        # Get previous periods with the current period's totals attached to each row
+        income_sum, expense_sum = period_totals(current_user.id, period_start, period_end)
+        rows = db.execute(
+            select(UCReport, income_sum, expense_sum).where(
+                UCReport.user_id == current_user.id
+            ).order_by(UCReport.period_start.desc()).limit(12)
+        ).all()
+        previous_periods = [report for report, _, _ in rows]
+        
+        if rows:
+            _, total_income, total_expenses = rows[0]
+            current_report = next(
+                (
+                    report for report in previous_periods
+                    if report.period_start == period_start and report.period_end == period_end
+                ),
+                None,
+            )
+            current_period = UCPeriodSummary(
+                period_start=period_start,
+                period_end=period_end,
+                total_income=total_income,
+                total_expenses=total_expenses,
+                net_profit=total_income - total_expenses,
+                reported_at=current_report.reported_at if current_report else None,
+                notes=current_report.notes if current_report else None,
+            )
+    
+    if current_period is None:
+        # No reports yet, so there was no row to carry the totals
+        current_period = get_uc_period_data(current_user, db)
     
     return templates.TemplateResponse("uc.html", {
         "request": request,
@@ -387,83 +507,52 @@ async def uc_page(
 
 
 @router.post("/uc/mark-reported")
-async def mark_uc_reported(
+def mark_uc_reported(
     period_start: date = Form(...),
     reported_at: date = Form(...),
     current_user: User = Depends(get_current_active_subscriber),
     db: Session = Depends(get_db),
 ):
     """Mark UC period as reported."""
-    # Find or create report
     period_end = get_uc_assessment_period(period_start, current_user.uc_assessment_day)[1]
+    income_sum, expense_sum = period_totals(current_user.id, period_start, period_end)
     
-    report = db.query(UCReport).filter(
-        and_(
-            UCReport.user_id == current_user.id,
-            UCReport.period_start == period_start,
-        )
-    ).first()
-    
-    if not report:
-        # Create report
-        incomes = db.query(Income).filter(
-            and_(
-                Income.user_id == current_user.id,
-                Income.date_received >= period_start,
-                Income.date_received <= period_end,
-            )
-        ).all()
-        
-        expenses = db.query(Expense).filter(
-            and_(
-                Expense.user_id == current_user.id,
-                Expense.date_paid >= period_start,
-                Expense.date_paid <= period_end,
-            )
-        ).all()
-        
-        total_income = sum((i.amount for i in incomes), Decimal("0.00"))
-        total_expenses = sum((e.amount for e in expenses), Decimal("0.00"))
-        
-        report = UCReport(
-            user_id=current_user.id,
-            period_start=period_start,
-            period_end=period_end,
-            total_income=total_income,
-            total_expenses=total_expenses,
-            net_profit=total_income - total_expenses,
+    # Create the report already marked as reported, or mark the existing one;
+    # ON CONFLICT settles concurrent submits for the same period atomically
+    stmt = pg_insert(UCReport).values(
+        user_id=current_user.id,
+        period_start=period_start,
+        period_end=period_end,
+        total_income=income_sum,
+        total_expenses=expense_sum,
+        net_profit=income_sum - expense_sum,
+        reported_at=reported_at,
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[UCReport.user_id, UCReport.period_start],
+            set_={"reported_at": reported_at, "updated_at": stmt.excluded.updated_at},
         )
-        db.add(report)
+    )
     
-    report.reported_at = reported_at
     db.commit()
     
     return RedirectResponse(url="/uc", status_code=303)
 
 
 @router.get("/settings", response_class=HTMLResponse)
-async def settings_page(
+def settings_page(
     request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Settings page."""
     # Calculate recommended tax percentage
-    from app.core.tax_calc import recommend_tax_set_aside_percentage
+    def load_profit() -> Decimal:
+        total_income, total_expenses = get_transaction_totals(db, current_user.id)
+        return total_income - total_expenses
     
-    total_income = db.query(func.sum(Income.amount)).filter(
-        Income.user_id == current_user.id
-    ).scalar() or Decimal("0.00")
-    
-    total_expenses = db.query(func.sum(Expense.amount)).filter(
-        Expense.user_id == current_user.id
-    ).scalar() or Decimal("0.00")
-    
-    projected_profit = total_income - total_expenses
-    recommendation = recommend_tax_set_aside_percentage(
-        projected_profit,
-        date.today()
-    )
+    recommendation = _get_recommendation(current_user.id, load_profit)
     
     return templates.TemplateResponse("settings.html", {
         "request": request,
@@ -488,7 +577,7 @@ async def exports_page(
 
 
 @router.post("/settings/profile")
-async def update_profile(
+def update_profile(
     full_name: str = Form(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -498,11 +587,12 @@ async def update_profile(
         current_user.full_name = full_name
     
     db.commit()
+    invalidate_user(current_user.supabase_id)
     return RedirectResponse(url="/settings", status_code=303)
 
 
 @router.post("/settings/trading")
-async def update_trading(
+def update_trading(
     trading_start_date: date = Form(...),
     tax_set_aside_percentage: Decimal = Form(...),
     current_user: User = Depends(get_current_user),
@@ -513,11 +603,12 @@ async def update_trading(
     current_user.tax_set_aside_percentage = tax_set_aside_percentage
     
     db.commit()
+    invalidate_user(current_user.supabase_id)
     return RedirectResponse(url="/settings", status_code=303)
 
 
 @router.post("/settings/uc")
-async def update_uc(
+def update_uc(
     uc_enabled: bool = Form(False),
     uc_assessment_day: int = Form(None),
     current_user: User = Depends(get_current_user),
@@ -529,16 +620,18 @@ async def update_uc(
         current_user.uc_assessment_day = uc_assessment_day
     
     db.commit()
+    invalidate_user(current_user.supabase_id)
     return RedirectResponse(url="/settings", status_code=303)
 
 
 @router.post("/settings/delete-account")
-async def delete_account(
+def delete_account(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Delete user account."""
     db.delete(current_user)
     db.commit()
+    invalidate_user(current_user.supabase_id)
     
     return RedirectResponse(url="/login", status_code=303)
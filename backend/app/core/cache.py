@@ -0,0 +1,174 @@
+"""Key-value cache with an optional Redis backend."""
+import threading
+import time
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.dates import get_current_tax_year
+
+
+class MemoryCache:
+    """
+    In-process TTL cache, used when REDIS_URL is not configured.
+    
+    Entries are only visible to the current worker process, so deployments
+    running several workers should configure Redis instead.
+    """
+    
+    # Whether every worker sees the same entries
+    shared = False
+    
+    def __init__(self, maxsize: int = 10_000):
+        self._data: Dict[str, Tuple[float, bytes]] = {}
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+    
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            
+            return value
+    
+    def get_many(self, *keys: str) -> List[Optional[bytes]]:
+        """Return the cached values of several keys, with None for missing ones."""
+        return [self.get(key) for key in keys]
+    
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        """Store a value for ttl seconds, evicting the oldest entry when full."""
+        with self._lock:
+            if key not in self._data and len(self._data) >= self._maxsize:
+                self._data.pop(next(iter(self._data)))
+            self._data[key] = (time.monotonic() + ttl, value)
+    
+    def incr(self, key: str) -> Optional[int]:
+        """Increment a counter that never expires, starting from 0, and return it."""
+        with self._lock:
+            entry = self._data.get(key)
+            value = int(entry[1]) + 1 if entry else 1
+            self._data[key] = (float("inf"), str(value).encode())
+            return value
+    
+    def delete(self, *keys: str) -> None:
+        """Remove keys from the cache."""
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+
+class RedisCache:
+    """
+    Redis-backed cache shared by all workers.
+    
+    Redis errors are treated as cache misses so an unavailable cache never
+    fails a request.
+    """
+    
+    shared = True
+    
+    def __init__(self, url: str):
+        import redis
+        
+        self._client = redis.Redis.from_url(url)
+        self._errors = redis.RedisError
+    
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached value, or None if missing or Redis is unavailable."""
+        try:
+            return self._client.get(key)
+        except self._errors:
+            return None
+    
+    def get_many(self, *keys: str) -> List[Optional[bytes]]:
+        """Return the cached values of several keys in one round-trip, with None for missing ones."""
+        try:
+            return self._client.mget(keys)
+        except self._errors:
+            return [None] * len(keys)
+    
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        """Store a value for ttl seconds."""
+        try:
+            self._client.setex(key, ttl, value)
+        except self._errors:
+            pass
+    
+    def incr(self, key: str) -> Optional[int]:
+        """Increment a counter that never expires, starting from 0, and return it (None if unavailable)."""
+        try:
+            return self._client.incr(key)
+        except self._errors:
+            return None
+    
+    def delete(self, *keys: str) -> None:
+        """Remove keys from the cache."""
+        if not keys:
+            return
+        try:
+            self._client.delete(*keys)
+        except self._errors:
+            pass
+
+
+cache = RedisCache(settings.REDIS_URL) if settings.REDIS_URL else MemoryCache()
+
+
+def tax_totals_key(user_id, tax_year: str) -> str:
+    """Cache key for a user's aggregated income/expense totals in a tax year."""
+    return f"tax:{user_id}:{tax_year}"
+
+
+def user_key(supabase_id: str) -> str:
+    """Cache key for the user row of an authenticated Supabase account."""
+    return f"user:{supabase_id}"
+
+
+def user_version_key(supabase_id: str) -> str:
+    """Cache key for the version counter of an authenticated Supabase account's user row."""
+    return f"user_version:{supabase_id}"
+
+
+def invalidate_user(*supabase_ids: str) -> None:
+    """
+    Drop cached user rows after the users are updated or deleted.
+    
+    Bumps each user's version rather than deleting the row, so a request
+    that read the row before the change can't cache it again afterwards:
+    it stored the old version, which no longer matches.
+    
+    Args:
+        supabase_ids: Supabase IDs of the changed users
+    """
+    for supabase_id in set(supabase_ids):
+        cache.incr(user_version_key(supabase_id))
+
+
+def recommendation_key(user_id, day: date) -> str:
+    """Cache key for a user's all-time tax set-aside recommendation on a given day."""
+    return f"rec:{user_id}:{day.isoformat()}"
+
+
+def invalidate_tax_totals(user_id, *tax_years: str) -> None:
+    """
+    Drop cached tax year totals after a user's transactions change.
+    
+    Today's set-aside recommendation is dropped too, as it is derived from
+    the same transactions, and so are the current tax year's totals, which
+    carry this month's income count even when the month spans two tax years.
+    
+    Args:
+        user_id: Owner of the transactions
+        tax_years: Tax years affected by the change
+    """
+    cache.delete(
+        recommendation_key(user_id, date.today()),
+        *(tax_totals_key(user_id, tax_year) for tax_year in {get_current_tax_year(), *tax_years}),
+    )
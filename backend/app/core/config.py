@@ -13,6 +13,14 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_TIMEOUT: int = 5  # Seconds to wait for a pooled connection
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced
+    DB_ECHO: bool = False  # Log every SQL statement (development only)
+    
+    # Cache (optional; falls back to a per-process cache when unset)
+    REDIS_URL: str = ""
     
     # Supabase
     SUPABASE_URL: str
@@ -1,8 +1,10 @@
 """UK tax year and date handling utilities."""
 from datetime import date, timedelta
+from functools import lru_cache
 from typing import Tuple
 
 
+@lru_cache(maxsize=4096)
 def get_tax_year(transaction_date: date) -> str:
     """
     Returns the UK tax year string for a given date.
@@ -15,17 +17,12 @@ def get_tax_year(transaction_date: date) -> str:
     Returns:
         Tax year string in format "YYYY-YY" (e.g., "2024-25")
     """
-    if transaction_date.month < 4 or (transaction_date.month == 4 and transaction_date.day < 6):
-        # Before April 6: use previous year as start
-        start_year = transaction_date.year - 1
-    else:
-        # April 6 onwards: current year is start
-        start_year = transaction_date.year
-    
-    end_year = start_year + 1
-    return f"{start_year}-{str(end_year)[2:]}"
+    # Dates before April 6 belong to the tax year that started the previous year
+    start_year = transaction_date.year - ((transaction_date.month, transaction_date.day) < (4, 6))
+    return f"{start_year}-{(start_year + 1) % 100:02d}"
 
 
+@lru_cache(maxsize=128)
 def get_tax_year_dates(tax_year: str) -> Tuple[date, date]:
     """
     Returns start and end dates for a UK tax year.
@@ -36,7 +33,7 @@ def get_tax_year_dates(tax_year: str) -> Tuple[date, date]:
     Returns:
         Tuple of (start_date, end_date)
     """
-    start_year = int(tax_year.split("-")[0])
+    start_year = int(tax_year[:4])
     start_date = date(start_year, 4, 6)
     end_date = date(start_year + 1, 4, 5)
     return start_date, end_date
@@ -47,6 +44,7 @@ def get_current_tax_year() -> str:
     return get_tax_year(date.today())
 
 
+@lru_cache(maxsize=4096)
 def get_hmrc_registration_deadline(trading_start_date: date) -> date:
     """
     Calculate HMRC Self Assessment registration deadline.
@@ -71,6 +69,7 @@ def get_hmrc_registration_deadline(trading_start_date: date) -> date:
     return date(deadline_year, 10, 5)
 
 
+@lru_cache(maxsize=4096)
 def get_uc_assessment_period(reference_date: date, assessment_day: int) -> Tuple[date, date]:
     """
     Calculate UC assessment period containing the reference date.
@@ -87,24 +86,16 @@ def get_uc_assessment_period(reference_date: date, assessment_day: int) -> Tuple
     if not 1 <= assessment_day <= 28:
         raise ValueError("Assessment day must be between 1 and 28")
     
-    # Determine which period the reference date falls in
-    if reference_date.day >= assessment_day:
-        # Period starts this month
-        period_start = date(reference_date.year, reference_date.month, assessment_day)
-    else:
-        # Period started last month
-        if reference_date.month == 1:
-            period_start = date(reference_date.year - 1, 12, assessment_day)
-        else:
-            period_start = date(reference_date.year, reference_date.month - 1, assessment_day)
+    # Count months from year 0 so month wrap-around is plain arithmetic; the
+    # period started last month if the reference date is before the assessment day
+    start_month = reference_date.year * 12 + reference_date.month - 1 - (reference_date.day < assessment_day)
     
-    # Period ends day before next period starts
-    if period_start.month == 12:
-        next_period_start = date(period_start.year + 1, 1, assessment_day)
-    else:
-        next_period_start = date(period_start.year, period_start.month + 1, assessment_day)
+    year, month = divmod(start_month, 12)
+    period_start = date(year, month + 1, assessment_day)
     
-    period_end = next_period_start - timedelta(days=1)
+    # Period ends day before next period starts
+    year, month = divmod(start_month + 1, 12)
+    period_end = date(year, month + 1, assessment_day) - timedelta(days=1)
     
     return period_start, period_end
 
@@ -120,9 +111,7 @@ def get_next_uc_assessment_period(current_period_start: date, assessment_day: in
     Returns:
         Tuple of (next_period_start, next_period_end)
     """
-    if current_period_start.month == 12:
-        next_start = date(current_period_start.year + 1, 1, assessment_day)
-    else:
-        next_start = date(current_period_start.year, current_period_start.month + 1, assessment_day)
+    year, month = divmod(current_period_start.year * 12 + current_period_start.month, 12)
+    next_start = date(year, month + 1, assessment_day)
     
     return get_uc_assessment_period(next_start, assessment_day)
@@ -1,55 +1,145 @@
 """Tax calculation engine with ruleset versioning."""
+from bisect import bisect_right
 from decimal import Decimal
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Tuple
 from datetime import date
 
-from .tax_rulesets import get_ruleset_for_date
+from .dates import get_tax_year
+from .tax_rulesets import get_decimal_ruleset_by_tax_year
 
 
-def calculate_income_tax(profit: Decimal, ruleset: Dict[str, Any]) -> Decimal:
+BASIS_POINTS = 10000
+
+# Set-aside recommendation reasons, by the profit (in pence) at which each starts to apply
+_RECOMMENDATION_THRESHOLDS = (1257000, 2500000, 5027000, 10000000)
+_RECOMMENDATION_REASONS = (
+    "Below Personal Allowance - minimal tax expected",
+    "Basic rate taxpayer - 20% Income Tax + NI",
+    "Higher basic rate income - increased NI contributions",
+    "Higher rate taxpayer - 40% Income Tax on earnings over £50,270",
+    "High earner - 40%+ tax rates apply",
+)
+
+
+def _as_decimal(value: Any) -> Decimal:
+    """Return value as a Decimal, parsing via str() only for non-Decimal input."""
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def to_pence(amount: Decimal) -> int:
+    """Convert a monetary amount to whole pence, rounding half to even."""
+    return int(_as_decimal(amount).scaleb(2).to_integral_value())
+
+
+def from_pence(pence: int) -> Decimal:
+    """Convert whole pence to a two-decimal-place Decimal amount."""
+    return Decimal(pence).scaleb(-2)
+
+
+def _divide_half_even(numerator: int, denominator: int) -> int:
+    """Divide two integers (denominator > 0), rounding the quotient half to even."""
+    quotient, remainder = divmod(numerator, denominator)
+    if remainder * 2 > denominator or (remainder * 2 == denominator and quotient % 2):
+        quotient += 1
+    return quotient
+
+
+def _apply_rate(pence_bps: int) -> int:
+    """Round a pence x basis-points product to whole pence, half to even."""
+    return _divide_half_even(pence_bps, BASIS_POINTS)
+
+
+def calculate_income_tax_pence(profit: int, ruleset: Dict[str, int]) -> int:
     """
-    Calculate income tax on self-employment profit.
+    Calculate income tax on self-employment profit in integer pence.
     
     Args:
-        profit: Net profit for the tax year
-        ruleset: Tax ruleset to use
-        
+        profit: Net profit for the tax year, in pence
+        ruleset: Pence ruleset to use (the "pence" entry of a Decimal ruleset)
+    
     Returns:
-        Income tax amount
+        Income tax amount in pence
     """
-    if profit <= 0:
-        return Decimal("0.00")
-    
-    profit = Decimal(str(profit))
-    personal_allowance = Decimal(str(ruleset["personal_allowance"]))
-    basic_rate_threshold = Decimal(str(ruleset["basic_rate_threshold"]))
-    higher_rate_threshold = Decimal(str(ruleset["higher_rate_threshold"]))
-    
     # Taxable income after personal allowance
-    taxable = max(Decimal("0"), profit - personal_allowance)
+    taxable = profit - ruleset["personal_allowance"]
     
-    if taxable == 0:
-        return Decimal("0.00")
-    
-    tax = Decimal("0.00")
+    if taxable <= 0:
+        return 0
     
     # Basic rate band
-    basic_band_limit = basic_rate_threshold - personal_allowance
-    basic_taxable = min(taxable, basic_band_limit)
-    tax += basic_taxable * Decimal(str(ruleset["basic_rate"]))
+    basic_band_limit = ruleset["basic_band_limit"]
+    tax = min(taxable, basic_band_limit) * ruleset["basic_rate"]
     
     # Higher rate band
     if taxable > basic_band_limit:
-        higher_band_limit = higher_rate_threshold - basic_rate_threshold
-        higher_taxable = min(taxable - basic_band_limit, higher_band_limit)
-        tax += higher_taxable * Decimal(str(ruleset["higher_rate"]))
+        higher_taxable = min(taxable - basic_band_limit, ruleset["higher_band_limit"])
+        tax += higher_taxable * ruleset["higher_rate"]
         
         # Additional rate band
-        if taxable > (higher_rate_threshold - personal_allowance):
-            additional_taxable = taxable - (higher_rate_threshold - personal_allowance)
-            tax += additional_taxable * Decimal(str(ruleset["additional_rate"]))
+        if taxable > ruleset["additional_band_start"]:
+            tax += (taxable - ruleset["additional_band_start"]) * ruleset["additional_rate"]
+    
+    return _apply_rate(tax)
+
+
+def calculate_ni_class2_pence(profit: int, ruleset: Dict[str, int]) -> int:
+    """
+    Calculate National Insurance Class 2 in integer pence.
+    
+    Args:
+        profit: Net profit for the tax year, in pence
+        ruleset: Pence ruleset to use (the "pence" entry of a Decimal ruleset)
+    
+    Returns:
+        NI Class 2 amount (52 weeks) in pence
+    """
+    if profit <= 0 or profit < ruleset["ni_class2_threshold"]:
+        return 0
+    
+    return ruleset["ni_class2_annual"]
+
+
+def calculate_ni_class4_pence(profit: int, ruleset: Dict[str, int]) -> int:
+    """
+    Calculate National Insurance Class 4 in integer pence.
+    
+    Args:
+        profit: Net profit for the tax year, in pence
+        ruleset: Pence ruleset to use (the "pence" entry of a Decimal ruleset)
+    
+    Returns:
+        NI Class 4 amount in pence
+    """
+    lower_threshold = ruleset["ni_class4_lower_threshold"]
+    upper_threshold = ruleset["ni_class4_upper_threshold"]
+    
+    # No NI Class 4 below lower threshold
+    if profit <= lower_threshold:
+        return 0
+    
+    # Main rate (between lower and upper threshold)
+    ni = (min(profit, upper_threshold) - lower_threshold) * ruleset["ni_class4_rate"]
+    
+    # Higher rate (above upper threshold)
+    if profit > upper_threshold:
+        ni += (profit - upper_threshold) * ruleset["ni_class4_higher_rate"]
+    
+    return _apply_rate(ni)
+
+
+def calculate_income_tax(profit: Decimal, ruleset: Dict[str, Any]) -> Decimal:
+    """
+    Calculate income tax on self-employment profit.
     
-    return tax.quantize(Decimal("0.01"))
+    Args:
+        profit: Net profit for the tax year
+        ruleset: Decimal tax ruleset to use (see get_decimal_ruleset_for_date)
+        
+    Returns:
+        Income tax amount
+    """
+    return from_pence(calculate_income_tax_pence(to_pence(profit), ruleset["pence"]))
 
 
 def calculate_ni_class2(profit: Decimal, ruleset: Dict[str, Any]) -> Decimal:
@@ -60,24 +150,12 @@ def calculate_ni_class2(profit: Decimal, ruleset: Dict[str, Any]) -> Decimal:
     
     Args:
         profit: Net profit for the tax year
-        ruleset: Tax ruleset to use
+        ruleset: Decimal tax ruleset to use (see get_decimal_ruleset_for_date)
         
     Returns:
         NI Class 2 amount (52 weeks)
     """
-    if profit <= 0:
-        return Decimal("0.00")
-    
-    profit = Decimal(str(profit))
-    threshold = Decimal(str(ruleset["ni_class2_threshold"]))
-    
-    if profit < threshold:
-        return Decimal("0.00")
-    
-    weekly_rate = Decimal(str(ruleset["ni_class2_weekly"]))
-    annual = weekly_rate * 52
-    
-    return annual.quantize(Decimal("0.01"))
+    return from_pence(calculate_ni_class2_pence(to_pence(profit), ruleset["pence"]))
 
 
 def calculate_ni_class4(profit: Decimal, ruleset: Dict[str, Any]) -> Decimal:
@@ -86,62 +164,55 @@ def calculate_ni_class4(profit: Decimal, ruleset: Dict[str, Any]) -> Decimal:
     
     Args:
         profit: Net profit for the tax year
-        ruleset: Tax ruleset to use
+        ruleset: Decimal tax ruleset to use (see get_decimal_ruleset_for_date)
         
     Returns:
         NI Class 4 amount
     """
-    if profit <= 0:
-        return Decimal("0.00")
-    
-    profit = Decimal(str(profit))
-    lower_threshold = Decimal(str(ruleset["ni_class4_lower_threshold"]))
-    upper_threshold = Decimal(str(ruleset["ni_class4_upper_threshold"]))
-    
-    # No NI Class 4 below lower threshold
-    if profit <= lower_threshold:
-        return Decimal("0.00")
-    
-    ni = Decimal("0.00")
-    
-    # Main rate (between lower and upper threshold)
-    main_rate_profit = min(profit, upper_threshold) - lower_threshold
-    ni += main_rate_profit * Decimal(str(ruleset["ni_class4_rate"]))
-    
-    # Higher rate (above upper threshold)
-    if profit > upper_threshold:
-        higher_rate_profit = profit - upper_threshold
-        ni += higher_rate_profit * Decimal(str(ruleset["ni_class4_higher_rate"]))
-    
-    return ni.quantize(Decimal("0.01"))
+    return from_pence(calculate_ni_class4_pence(to_pence(profit), ruleset["pence"]))
 
 
 def calculate_total_tax(profit: Decimal, transaction_date: date) -> Dict[str, Any]:
     """
     Calculate all tax obligations for a given profit and date.
     
-    Uses the correct ruleset based on transaction date.
+    Uses the correct ruleset based on transaction date. Results are memoised
+    per (profit in pence, tax year).
     
     Args:
         profit: Net profit
         transaction_date: Date to determine tax year/ruleset
         
     Returns:
-        Dictionary with breakdown of all taxes
+        Dictionary with breakdown of all taxes, amounts as two-place Decimals
     """
-    ruleset = get_ruleset_for_date(transaction_date)
+    return dict(_calculate_total_tax(to_pence(profit), get_tax_year(transaction_date)))
+
+
+def _tax_breakdown_pence(profit_pence: int, rates: Dict[str, int]) -> Tuple[int, int, int]:
+    """Return (income_tax, ni_class2, ni_class4) in pence for a profit in pence."""
+    return (
+        calculate_income_tax_pence(profit_pence, rates),
+        calculate_ni_class2_pence(profit_pence, rates),
+        calculate_ni_class4_pence(profit_pence, rates),
+    )
+
+
+@lru_cache(maxsize=4096)
+def _calculate_total_tax(profit_pence: int, tax_year: str) -> Dict[str, Any]:
+    """Cached core of calculate_total_tax; callers must not mutate the result."""
+    ruleset = get_decimal_ruleset_by_tax_year(tax_year)
     
-    income_tax = calculate_income_tax(profit, ruleset)
-    ni_class2 = calculate_ni_class2(profit, ruleset)
-    ni_class4 = calculate_ni_class4(profit, ruleset)
+    # Work in integer pence and convert once at the end
+    income_tax, ni_class2, ni_class4 = _tax_breakdown_pence(profit_pence, ruleset["pence"])
     total = income_tax + ni_class2 + ni_class4
     
     return {
-        "income_tax": float(income_tax),
-        "ni_class2": float(ni_class2),
-        "ni_class4": float(ni_class4),
-        "total_tax": float(total),
-        "tax_year": ruleset["version"].split("-v")[0],
+        "income_tax": from_pence(income_tax),
+        "ni_class2": from_pence(ni_class2),
+        "ni_class4": from_pence(ni_class4),
+        "total_tax": from_pence(total),
+        "tax_year": tax_year,
         "ruleset_version": ruleset["version"],
     }
 
@@ -166,8 +237,8 @@ def calculate_tax_to_set_aside(
     if amount <= 0 or set_aside_percentage <= 0:
         return Decimal("0.00")
     
-    amount = Decimal(str(amount))
-    percentage = Decimal(str(set_aside_percentage)) / 100
+    amount = _as_decimal(amount)
+    percentage = _as_decimal(set_aside_percentage) / 100
     
     return (amount * percentage).quantize(Decimal("0.01"))
 
@@ -179,7 +250,8 @@ def recommend_tax_set_aside_percentage(
     """
     Recommend a tax set-aside percentage based on projected annual profit.
     
-    Calculates the effective tax rate and adds a buffer for safety.
+    Calculates the effective tax rate and adds a buffer for safety. Results
+    are memoised per (profit in pence, tax year).
     
     Args:
         projected_annual_profit: Estimated annual profit
@@ -188,44 +260,41 @@ def recommend_tax_set_aside_percentage(
     Returns:
         Dictionary with recommended percentage and reasoning
     """
-    if projected_annual_profit <= 0:
+    return dict(_recommend_tax_set_aside_percentage(
+        to_pence(projected_annual_profit),
+        get_tax_year(transaction_date),
+    ))
+
+
+@lru_cache(maxsize=4096)
+def _recommend_tax_set_aside_percentage(profit_pence: int, tax_year: str) -> Dict[str, Any]:
+    """Cached core of recommend_tax_set_aside_percentage; callers must not mutate the result."""
+    if profit_pence <= 0:
         return {
             "recommended_percentage": 20,
             "reason": "Default recommendation",
             "is_sufficient": True
         }
     
-    # Calculate actual tax on projected profit
-    tax_breakdown = calculate_total_tax(projected_annual_profit, transaction_date)
-    total_tax = Decimal(str(tax_breakdown["total_tax"]))
-    
-    # Calculate effective tax rate
-    effective_rate = (total_tax / projected_annual_profit * 100) if projected_annual_profit > 0 else Decimal("0")
+    # Calculate actual tax on projected profit, in pence
+    rates = get_decimal_ruleset_by_tax_year(tax_year)["pence"]
+    total_tax_pence = sum(_tax_breakdown_pence(profit_pence, rates))
     
-    # Add 5% buffer for safety and round up to nearest 5%
-    recommended = int((effective_rate + 5).quantize(Decimal("1")))
-    recommended = ((recommended + 4) // 5) * 5  # Round up to nearest 5
+    # Effective tax rate as a percentage, plus a 5% buffer for safety,
+    # rounded half to even as integer fractions of the profit
+    recommended = _divide_half_even(total_tax_pence * 100 + 5 * profit_pence, profit_pence)
+    effective_rate_tenths = _divide_half_even(total_tax_pence * 1000, profit_pence)
     
-    # Minimum 15%, maximum 50%
+    # Round up to nearest 5%, then clamp to a minimum 15%, maximum 50%
+    recommended = ((recommended + 4) // 5) * 5
     recommended = max(15, min(50, recommended))
     
     # Determine reason based on profit thresholds
-    profit_float = float(projected_annual_profit)
-    
-    if profit_float < 12570:
-        reason = "Below Personal Allowance - minimal tax expected"
-    elif profit_float < 25000:
-        reason = "Basic rate taxpayer - 20% Income Tax + NI"
-    elif profit_float < 50270:
-        reason = "Higher basic rate income - increased NI contributions"
-    elif profit_float < 100000:
-        reason = "Higher rate taxpayer - 40% Income Tax on earnings over £50,270"
-    else:
-        reason = "High earner - 40%+ tax rates apply"
+    reason = _RECOMMENDATION_REASONS[bisect_right(_RECOMMENDATION_THRESHOLDS, profit_pence)]
     
     return {
         "recommended_percentage": recommended,
-        "effective_tax_rate": float(effective_rate.quantize(Decimal("0.1"))),
+        "effective_tax_rate": effective_rate_tenths / 10,
         "reason": reason,
         "is_sufficient": True
     }
@@ -1,10 +1,12 @@
 """UK tax rulesets versioned by tax year."""
 from datetime import date
+from decimal import Decimal
+from functools import lru_cache
 from typing import Dict, Any
 from .dates import get_tax_year
 
 
-# Tax rulesets by UK tax year
+# Tax rulesets by UK tax year, defined in code so they are loaded once at import
 # All monetary values in GBP
 TAX_RULESETS: Dict[str, Dict[str, Any]] = {
     "2023-24": {
@@ -68,6 +70,7 @@ TAX_RULESETS: Dict[str, Dict[str, Any]] = {
 }
 
 
+@lru_cache(maxsize=2048)
 def get_ruleset_for_date(transaction_date: date) -> Dict[str, Any]:
     """
     Get the tax ruleset for a specific transaction date.
@@ -81,17 +84,10 @@ def get_ruleset_for_date(transaction_date: date) -> Dict[str, Any]:
     Raises:
         ValueError: If no ruleset exists for that tax year
     """
-    tax_year = get_tax_year(transaction_date)
-    
-    if tax_year not in TAX_RULESETS:
-        raise ValueError(
-            f"No tax ruleset available for tax year {tax_year}. "
-            f"Available years: {', '.join(TAX_RULESETS.keys())}"
-        )
-    
-    return TAX_RULESETS[tax_year]
+    return get_ruleset_by_tax_year(get_tax_year(transaction_date))
 
 
+@lru_cache(maxsize=64)
 def get_ruleset_by_tax_year(tax_year: str) -> Dict[str, Any]:
     """
     Get the tax ruleset for a specific tax year string.
@@ -114,6 +110,80 @@ def get_ruleset_by_tax_year(tax_year: str) -> Dict[str, Any]:
     return TAX_RULESETS[tax_year]
 
 
+def _to_pence_ruleset(ruleset: Dict[str, Any]) -> Dict[str, int]:
+    """Express a Decimal ruleset's amounts in pence and its rates in basis points."""
+    return {
+        key: int(value * 10000) if key.endswith("rate") else int(value * 100)
+        for key, value in ruleset.items()
+        if isinstance(value, Decimal)
+    }
+
+
+def _to_decimal_ruleset(ruleset: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a ruleset's numeric fields to Decimal and add derived band limits.
+    
+    The same values in integer pence and basis points are stored under
+    "pence" for the integer tax calculations.
+    """
+    converted = {
+        key: Decimal(str(value)) if isinstance(value, (int, float)) else value
+        for key, value in ruleset.items()
+    }
+    
+    # Band widths used by the tax calculations, so they are only subtracted once
+    converted["basic_band_limit"] = (
+        converted["basic_rate_threshold"] - converted["personal_allowance"]
+    )
+    converted["higher_band_limit"] = (
+        converted["higher_rate_threshold"] - converted["basic_rate_threshold"]
+    )
+    converted["additional_band_start"] = (
+        converted["higher_rate_threshold"] - converted["personal_allowance"]
+    )
+    converted["ni_class2_annual"] = (converted["ni_class2_weekly"] * 52).quantize(Decimal("0.01"))
+    converted["pence"] = _to_pence_ruleset(converted)
+    
+    return converted
+
+
+@lru_cache(maxsize=2048)
+def get_decimal_ruleset_for_date(transaction_date: date) -> Dict[str, Any]:
+    """
+    Get the tax ruleset for a date with numeric values as Decimal.
+    
+    Args:
+        transaction_date: Date of the transaction
+    
+    Returns:
+        Converted ruleset, as used by the tax calculations
+    
+    Raises:
+        ValueError: If no ruleset exists for that tax year
+    """
+    return get_decimal_ruleset_by_tax_year(get_tax_year(transaction_date))
+
+
+@lru_cache(maxsize=64)
+def get_decimal_ruleset_by_tax_year(tax_year: str) -> Dict[str, Any]:
+    """
+    Get the tax ruleset for a tax year with numeric values as Decimal.
+    
+    Converted once per tax year, so the tax calculations do no str()/Decimal()
+    conversion of ruleset values per call.
+    
+    Args:
+        tax_year: Tax year string (e.g., "2024-25")
+    
+    Returns:
+        Converted ruleset, as used by the tax calculations
+    
+    Raises:
+        ValueError: If no ruleset exists for that tax year
+    """
+    return _to_decimal_ruleset(get_ruleset_by_tax_year(tax_year))
+
+
 def get_available_tax_years() -> list[str]:
     """Returns list of tax years with available rulesets."""
     return sorted(TAX_RULESETS.keys())
@@ -1,15 +1,20 @@
 """Database connection and session management."""
-from sqlalchemy import create_engine
+from sqlalchemy import ColumnElement, create_engine, func, literal, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import Any, Generator, Iterable
 
 from app.core.config import settings
 
 # Create engine
 engine = create_engine(
     settings.DATABASE_URL,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
     pool_pre_ping=True,
-    echo=settings.DEBUG,
+    echo=settings.DB_ECHO,
 )
 
 # Create session factory
@@ -28,3 +33,35 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+def warm_pool() -> None:
+    """
+    Open a pooled connection at startup.
+    
+    Pays the connection handshake before the first request arrives.
+    """
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+def in_array(column: ColumnElement, values: Iterable[Any]) -> ColumnElement:
+    """
+    Build an IN filter that binds all values as a single array parameter.
+    
+    On PostgreSQL this renders as column IN (SELECT unnest(:p::type[])),
+    so long ID lists don't cost one bound parameter each or run into the
+    parameter limit. Other dialects get a plain IN list.
+    
+    Args:
+        column: Column to filter on
+        values: Values to match
+    
+    Returns:
+        Filter expression
+    """
+    values = list(values)
+    if engine.dialect.name != "postgresql":
+        return column.in_(values)
+    
+    return column.in_(select(func.unnest(literal(values, ARRAY(column.type)))))
@@ -3,5 +3,6 @@ from .income import Income
 from .expense import Expense
 from .uc_report import UCReport
 from .tax_snapshot import TaxSnapshot
+from .stripe_event import StripeEvent
 
-__all__ = ["User", "Income", "Expense", "UCReport", "TaxSnapshot"]
+__all__ = ["User", "Income", "Expense", "UCReport", "TaxSnapshot", "StripeEvent"]
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, DateTime
+from sqlalchemy import Column, Computed, DateTime
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -9,3 +9,20 @@ class TimestampMixin:
     """Mixin for created_at and updated_at timestamps."""
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+def uk_tax_year(date_column: str) -> Computed:
+    """
+    Stored generated column holding the UK tax year ("YYYY-YY") of a date column.
+    
+    Mirrors app.core.dates.get_tax_year: dates before 6 April belong to the
+    tax year that started the previous calendar year.
+    """
+    start_year = (
+        f"(EXTRACT(YEAR FROM {date_column})::int"
+        f" - (EXTRACT(MONTH FROM {date_column}) * 100 + EXTRACT(DAY FROM {date_column}) < 406)::int)"
+    )
+    return Computed(
+        f"{start_year}::text || '-' || lpad((({start_year} + 1) % 100)::text, 2, '0')",
+        persisted=True,
+    )
@@ -1,9 +1,9 @@
-from sqlalchemy import Column, String, Date, Numeric, ForeignKey
+from sqlalchemy import Column, String, Date, Numeric, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
 
-from .base import Base, TimestampMixin
+from .base import Base, TimestampMixin, uk_tax_year
 
 
 class Expense(Base, TimestampMixin):
@@ -20,7 +20,21 @@ class Expense(Base, TimestampMixin):
     description = Column(String, nullable=False)
     
     # Tax calculation metadata
-    tax_year = Column(String(7), nullable=False, index=True)  # e.g., "2024-25"
+    tax_year = Column(String(7), uk_tax_year("date_paid"), nullable=False)  # e.g., "2024-25"
     
     # Relationships
     user = relationship("User", back_populates="expenses")
+    
+    __table_args__ = (
+        # Covers the per-user, per-tax-year listings ordered by most recent first;
+        # the included amount makes the tax year sums index-only scans
+        Index(
+            "ix_expenses_user_year_date",
+            "user_id",
+            "tax_year",
+            date_paid.desc(),
+            postgresql_include=["amount"],
+        ),
+        # Covers date-range aggregates such as UC assessment periods
+        Index("ix_expenses_user_date", "user_id", "date_paid"),
+    )
@@ -1,9 +1,9 @@
-from sqlalchemy import Column, String, Date, Numeric, ForeignKey
+from sqlalchemy import Column, String, Date, Numeric, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
 
-from .base import Base, TimestampMixin
+from .base import Base, TimestampMixin, uk_tax_year
 
 
 class Income(Base, TimestampMixin):
@@ -22,8 +22,22 @@ class Income(Base, TimestampMixin):
     tax_saved = Column(Numeric(10, 2), nullable=True, default=None)  # Actual amount saved for tax
     
     # Tax calculation metadata
-    tax_year = Column(String(7), nullable=False, index=True)  # e.g., "2024-25"
+    tax_year = Column(String(7), uk_tax_year("date_received"), nullable=False)  # e.g., "2024-25"
     tax_ruleset_version = Column(String, nullable=False)  # Tracks which ruleset was used
     
     # Relationships
     user = relationship("User", back_populates="incomes")
+    
+    __table_args__ = (
+        # Covers the per-user, per-tax-year listings ordered by most recent first;
+        # the included columns make the tax year sums index-only scans
+        Index(
+            "ix_incomes_user_year_date",
+            "user_id",
+            "tax_year",
+            date_received.desc(),
+            postgresql_include=["amount", "tax_saved"],
+        ),
+        # Covers date-range aggregates (UC periods, this month's income)
+        Index("ix_incomes_user_date", "user_id", "date_received"),
+    )
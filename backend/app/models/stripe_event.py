@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String
+
+from .base import Base, TimestampMixin
+
+
+class StripeEvent(Base, TimestampMixin):
+    """Stripe webhook event that has been processed, recorded for idempotency."""
+    __tablename__ = "stripe_events"
+
+    id = Column(String, primary_key=True)  # Stripe event ID, e.g. "evt_..."
+    type = Column(String, nullable=False)  # e.g. "checkout.session.completed"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Date, Numeric, ForeignKey, JSON
+from sqlalchemy import Column, String, Date, Numeric, ForeignKey, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -35,3 +35,8 @@ class TaxSnapshot(Base, TimestampMixin):
     
     # Relationships
     user = relationship("User", back_populates="tax_snapshots")
+    
+    __table_args__ = (
+        # One snapshot per user per tax year
+        Index("ix_tax_snapshots_user_year", "user_id", "tax_year", unique=True),
+    )
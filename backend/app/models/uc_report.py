@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Date, Numeric, ForeignKey, Integer
+from sqlalchemy import Column, String, Date, Numeric, ForeignKey, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -28,3 +28,8 @@ class UCReport(Base, TimestampMixin):
     
     # Relationships
     user = relationship("User", back_populates="uc_reports")
+    
+    __table_args__ = (
+        # One report per user per assessment period
+        Index("ix_uc_reports_user_period", "user_id", "period_start", unique=True),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Date, Numeric, Integer
+from sqlalchemy import Column, String, Boolean, Date, Numeric, Integer, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -23,19 +23,21 @@ class User(Base, TimestampMixin):
     trading_start_date = Column(Date, nullable=True)
     
     # UC configuration
-    uc_enabled = Column(Boolean, default=False, nullable=False)
+    uc_enabled = Column(Boolean, server_default=text("false"), nullable=False)
     uc_assessment_day = Column(Integer, nullable=True)  # Day of month UC period starts (1-28)
     
     # Tax configuration
-    tax_set_aside_percentage = Column(Numeric(5, 2), default=20.00, nullable=False)
+    tax_set_aside_percentage = Column(Numeric(5, 2), server_default=text("20.00"), nullable=False)
     
     # Subscription
     stripe_customer_id = Column(String, unique=True, nullable=True, index=True)
-    subscription_status = Column(String, default="inactive", nullable=False)  # active, inactive, past_due, canceled
-    subscription_id = Column(String, nullable=True)
+    subscription_status = Column(String, server_default=text("'inactive'"), nullable=False)  # active, inactive, past_due, canceled
+    subscription_id = Column(String, unique=True, nullable=True, index=True)
     
-    # Relationships
-    incomes = relationship("Income", back_populates="user", cascade="all, delete-orphan")
-    expenses = relationship("Expense", back_populates="user", cascade="all, delete-orphan")
-    uc_reports = relationship("UCReport", back_populates="user", cascade="all, delete-orphan")
-    tax_snapshots = relationship("TaxSnapshot", back_populates="user", cascade="all, delete-orphan")
+    # Relationships (child rows are removed by the ON DELETE CASCADE foreign keys).
+    # Collections are never lazy loaded: query them with aggregates or load them
+    # explicitly, e.g. options(selectinload(User.incomes)), to avoid N+1 queries
+    incomes = relationship("Income", back_populates="user", cascade="all, delete-orphan", passive_deletes=True, lazy="raise_on_sql")
+    expenses = relationship("Expense", back_populates="user", cascade="all, delete-orphan", passive_deletes=True, lazy="raise_on_sql")
+    uc_reports = relationship("UCReport", back_populates="user", cascade="all, delete-orphan", passive_deletes=True, lazy="raise_on_sql")
+    tax_snapshots = relationship("TaxSnapshot", back_populates="user", cascade="all, delete-orphan", passive_deletes=True, lazy="raise_on_sql")
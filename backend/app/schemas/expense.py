@@ -1,6 +1,6 @@
 """Expense schemas for validation."""
-from pydantic import BaseModel, Field
-from datetime import date
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from datetime import date, datetime
 from decimal import Decimal
 from typing import Optional
 from uuid import UUID
@@ -19,6 +19,16 @@ EXPENSE_CATEGORIES = [
     "Other",
 ]
 
+# Hashed once for the category validators' membership checks
+EXPENSE_CATEGORIES_SET = frozenset(EXPENSE_CATEGORIES)
+
+
+def _validate_category(v: Optional[str]) -> Optional[str]:
+    """Reject categories outside EXPENSE_CATEGORIES."""
+    if v is not None and v not in EXPENSE_CATEGORIES_SET:
+        raise ValueError(f"Category must be one of: {', '.join(EXPENSE_CATEGORIES)}")
+    return v
+
 
 class ExpenseCreate(BaseModel):
     """Schema for creating expense transaction."""
@@ -26,6 +36,12 @@ class ExpenseCreate(BaseModel):
     amount: Decimal = Field(gt=0)
     category: str = Field(min_length=1, max_length=100)
     description: str = Field(min_length=1, max_length=500)
+    
+    @field_validator("category")
+    @classmethod
+    def validate_category(cls, v: str) -> str:
+        """Validate category is one of the known expense categories."""
+        return _validate_category(v)
 
 
 class ExpenseUpdate(BaseModel):
@@ -34,6 +50,12 @@ class ExpenseUpdate(BaseModel):
     amount: Optional[Decimal] = Field(None, gt=0)
     category: Optional[str] = Field(None, min_length=1, max_length=100)
     description: Optional[str] = Field(None, min_length=1, max_length=500)
+    
+    @field_validator("category")
+    @classmethod
+    def validate_category(cls, v: Optional[str]) -> Optional[str]:
+        """Validate category, if given, is one of the known expense categories."""
+        return _validate_category(v)
 
 
 class ExpenseResponse(BaseModel):
@@ -45,7 +67,6 @@ class ExpenseResponse(BaseModel):
     category: str
     description: str
     tax_year: str
-    created_at: date
+    created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
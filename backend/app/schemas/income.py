@@ -1,6 +1,6 @@
 """Income schemas for validation."""
-from pydantic import BaseModel, Field
-from datetime import date
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import date, datetime
 from decimal import Decimal
 from typing import Optional
 from uuid import UUID
@@ -29,7 +29,6 @@ class IncomeResponse(BaseModel):
     description: str
     tax_year: str
     tax_ruleset_version: str
-    created_at: date
+    created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
@@ -1,8 +1,8 @@
 """Tax calculation schemas."""
-from pydantic import BaseModel
-from datetime import date
+from pydantic import BaseModel, ConfigDict
+from datetime import date, datetime
 from decimal import Decimal
-from typing import Dict, Any
+from typing import Any, Dict, Optional
 from uuid import UUID
 
 
@@ -22,6 +22,7 @@ class TaxSummary(BaseModel):
     actual_tax_saved: Decimal  # Actual amount user has saved
     hmrc_registration_deadline: date
     vat_threshold_proximity: Decimal  # Percentage towards VAT threshold
+    recent_income_count: Optional[int] = None  # Income received since the 1st of this month (current tax year only)
 
 
 class TaxSnapshotResponse(BaseModel):
@@ -40,7 +41,6 @@ class TaxSnapshotResponse(BaseModel):
     total_tax: Decimal
     tax_ruleset_version: str
     ruleset_data: Dict[str, Any]
-    created_at: date
+    created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
@@ -1,6 +1,6 @@
 """Universal Credit report schemas."""
-from pydantic import BaseModel
-from datetime import date
+from pydantic import BaseModel, ConfigDict
+from datetime import date, datetime
 from decimal import Decimal
 from typing import Optional
 from uuid import UUID
@@ -28,10 +28,9 @@ class UCReportResponse(BaseModel):
     net_profit: Decimal
     reported_at: Optional[date]
     notes: Optional[str]
-    created_at: date
+    created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class UCReportMarkReported(BaseModel):
@@ -1,5 +1,5 @@
 """User schemas for validation."""
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 from datetime import date
 from decimal import Decimal
 from typing import Optional
@@ -41,8 +41,7 @@ class UserProfile(BaseModel):
     tax_set_aside_percentage: Decimal
     subscription_status: str
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class UserResponse(BaseModel):
@@ -57,5 +56,4 @@ class UserResponse(BaseModel):
     subscription_status: str
     stripe_customer_id: Optional[str]
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
@@ -1,9 +1,10 @@
 """Data export service for CSV and GDPR compliance."""
-import csv
-import io
-import json
-from typing import List
-from datetime import datetime
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import orjson
 
 from app.models.user import User
 from app.models.income import Income
@@ -12,6 +13,108 @@ from app.models.uc_report import UCReport
 from app.models.tax_snapshot import TaxSnapshot
 
 
+# Flush buffered CSV output once it reaches this many characters
+CSV_CHUNK_SIZE = 64 * 1024
+
+CSV_HEADER = "Type,Date,Amount,Description,Category,Tax Year,Created At\r\n"
+
+# Columns included in the full (GDPR) export, in output order
+INCOME_EXPORT_COLUMNS = (
+    Income.id,
+    Income.date_received,
+    Income.amount,
+    Income.description,
+    Income.tax_year,
+    Income.tax_ruleset_version,
+    Income.created_at,
+)
+EXPENSE_EXPORT_COLUMNS = (
+    Expense.id,
+    Expense.date_paid,
+    Expense.amount,
+    Expense.category,
+    Expense.description,
+    Expense.tax_year,
+    Expense.created_at,
+)
+UC_REPORT_EXPORT_COLUMNS = (
+    UCReport.id,
+    UCReport.period_start,
+    UCReport.period_end,
+    UCReport.total_income,
+    UCReport.total_expenses,
+    UCReport.net_profit,
+    UCReport.reported_at,
+    UCReport.notes,
+    UCReport.created_at,
+)
+TAX_SNAPSHOT_EXPORT_COLUMNS = (
+    TaxSnapshot.id,
+    TaxSnapshot.tax_year,
+    TaxSnapshot.tax_year_start,
+    TaxSnapshot.tax_year_end,
+    TaxSnapshot.total_income,
+    TaxSnapshot.total_expenses,
+    TaxSnapshot.net_profit,
+    TaxSnapshot.income_tax,
+    TaxSnapshot.ni_class2,
+    TaxSnapshot.ni_class4,
+    TaxSnapshot.total_tax,
+    TaxSnapshot.tax_ruleset_version,
+    TaxSnapshot.created_at,
+)
+
+
+def _csv_field(value: str) -> str:
+    """Quote a field the way csv.writer's default (excel) dialect does."""
+    if "," in value or '"' in value or "\n" in value or "\r" in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def iter_transactions_csv(
+    incomes: Iterable[Income],
+    expenses: Iterable[Expense],
+) -> Iterator[str]:
+    """
+    Generate CSV export of all transactions in chunks.
+    
+    Rows are buffered and yielded roughly every CSV_CHUNK_SIZE characters,
+    so memory stays bounded regardless of how many transactions are exported.
+    
+    Args:
+        incomes: Income transactions (any iterable, consumed lazily)
+        expenses: Expense transactions (any iterable, consumed lazily)
+        
+    Yields:
+        CSV text chunks
+    """
+    # Rows are formatted directly; only free-text fields can need quoting
+    income_lines = (
+        f"Income,{income.date_received.isoformat()},{income.amount:.2f},"
+        f"{_csv_field(income.description)},,{income.tax_year},{income.created_at.isoformat()}\r\n"
+        for income in incomes
+    )
+    expense_lines = (
+        f"Expense,{expense.date_paid.isoformat()},{expense.amount:.2f},"
+        f"{_csv_field(expense.description)},{_csv_field(expense.category)},"
+        f"{expense.tax_year},{expense.created_at.isoformat()}\r\n"
+        for expense in expenses
+    )
+    
+    parts = [CSV_HEADER]
+    size = len(CSV_HEADER)
+    for line in chain(income_lines, expense_lines):
+        parts.append(line)
+        size += len(line)
+        if size >= CSV_CHUNK_SIZE:
+            yield "".join(parts)
+            parts = []
+            size = 0
+    
+    yield "".join(parts)
+
+
 def generate_transactions_csv(incomes: List[Income], expenses: List[Expense]) -> str:
     """
     Generate CSV export of all transactions.
@@ -23,134 +126,57 @@ def generate_transactions_csv(incomes: List[Income], expenses: List[Expense]) ->
     Returns:
         CSV string
     """
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # Header
-    writer.writerow([
-        "Type",
-        "Date",
-        "Amount",
-        "Description",
-        "Category",
-        "Tax Year",
-        "Created At",
-    ])
-    
-    # Income rows
-    for income in incomes:
-        writer.writerow([
-            "Income",
-            income.date_received.isoformat(),
-            f"{income.amount:.2f}",
-            income.description,
-            "",
-            income.tax_year,
-            income.created_at.isoformat(),
-        ])
-    
-    # Expense rows
-    for expense in expenses:
-        writer.writerow([
-            "Expense",
-            expense.date_paid.isoformat(),
-            f"{expense.amount:.2f}",
-            expense.description,
-            expense.category,
-            expense.tax_year,
-            expense.created_at.isoformat(),
-        ])
-    
-    return output.getvalue()
+    return "".join(iter_transactions_csv(incomes, expenses))
+
+
+def _json_default(value: Any) -> str:
+    """Serialise Decimal money values as exact strings (e.g. "1000.00"), as the API does."""
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError
 
 
 def generate_full_export(
     user: User,
-    incomes: List[Income],
-    expenses: List[Expense],
-    uc_reports: List[UCReport],
-    tax_snapshots: List[TaxSnapshot],
-) -> dict:
+    incomes: List[Dict[str, Any]],
+    expenses: List[Dict[str, Any]],
+    uc_reports: List[Dict[str, Any]],
+    tax_snapshots: List[Dict[str, Any]],
+) -> bytes:
     """
     Generate complete data export for GDPR compliance.
     
+    Rows are serialised as they are by orjson, so each row's keys are the
+    names of the *_EXPORT_COLUMNS it was selected with.
+    
     Args:
         user: User account
-        incomes: All income transactions
-        expenses: All expense transactions
-        uc_reports: All UC reports
-        tax_snapshots: All tax snapshots
+        incomes: All income transactions, as dicts of INCOME_EXPORT_COLUMNS
+        expenses: All expense transactions, as dicts of EXPENSE_EXPORT_COLUMNS
+        uc_reports: All UC reports, as dicts of UC_REPORT_EXPORT_COLUMNS
+        tax_snapshots: All tax snapshots, as dicts of TAX_SNAPSHOT_EXPORT_COLUMNS
         
     Returns:
-        Dictionary with all user data
+        JSON document with all user data
     """
-    return {
-        "export_date": datetime.utcnow().isoformat(),
-        "user": {
-            "id": str(user.id),
-            "email": user.email,
-            "full_name": user.full_name,
-            "trading_start_date": user.trading_start_date.isoformat() if user.trading_start_date else None,
-            "uc_enabled": user.uc_enabled,
-            "uc_assessment_day": user.uc_assessment_day,
-            "tax_set_aside_percentage": float(user.tax_set_aside_percentage),
-            "subscription_status": user.subscription_status,
-            "created_at": user.created_at.isoformat(),
+    return orjson.dumps(
+        {
+            "export_date": datetime.now(timezone.utc),
+            "user": {
+                "id": user.id,
+                "email": user.email,
+                "full_name": user.full_name,
+                "trading_start_date": user.trading_start_date,
+                "uc_enabled": user.uc_enabled,
+                "uc_assessment_day": user.uc_assessment_day,
+                "tax_set_aside_percentage": user.tax_set_aside_percentage,
+                "subscription_status": user.subscription_status,
+                "created_at": user.created_at,
+            },
+            "incomes": incomes,
+            "expenses": expenses,
+            "uc_reports": uc_reports,
+            "tax_snapshots": tax_snapshots,
         },
-        "incomes": [
-            {
-                "id": str(i.id),
-                "date_received": i.date_received.isoformat(),
-                "amount": float(i.amount),
-                "description": i.description,
-                "tax_year": i.tax_year,
-                "tax_ruleset_version": i.tax_ruleset_version,
-                "created_at": i.created_at.isoformat(),
-            }
-            for i in incomes
-        ],
-        "expenses": [
-            {
-                "id": str(e.id),
-                "date_paid": e.date_paid.isoformat(),
-                "amount": float(e.amount),
-                "category": e.category,
-                "description": e.description,
-                "tax_year": e.tax_year,
-                "created_at": e.created_at.isoformat(),
-            }
-            for e in expenses
-        ],
-        "uc_reports": [
-            {
-                "id": str(r.id),
-                "period_start": r.period_start.isoformat(),
-                "period_end": r.period_end.isoformat(),
-                "total_income": float(r.total_income),
-                "total_expenses": float(r.total_expenses),
-                "net_profit": float(r.net_profit),
-                "reported_at": r.reported_at.isoformat() if r.reported_at else None,
-                "notes": r.notes,
-                "created_at": r.created_at.isoformat(),
-            }
-            for r in uc_reports
-        ],
-        "tax_snapshots": [
-            {
-                "id": str(s.id),
-                "tax_year": s.tax_year,
-                "tax_year_start": s.tax_year_start.isoformat(),
-                "tax_year_end": s.tax_year_end.isoformat(),
-                "total_income": float(s.total_income),
-                "total_expenses": float(s.total_expenses),
-                "net_profit": float(s.net_profit),
-                "income_tax": float(s.income_tax),
-                "ni_class2": float(s.ni_class2),
-                "ni_class4": float(s.ni_class4),
-                "total_tax": float(s.total_tax),
-                "tax_ruleset_version": s.tax_ruleset_version,
-                "created_at": s.created_at.isoformat(),
-            }
-            for s in tax_snapshots
-        ],
-    }
+        default=_json_default,
+    )
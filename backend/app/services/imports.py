@@ -0,0 +1,46 @@
+"""Bulk transaction import service."""
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Tuple
+from uuid import UUID
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.expense import Expense
+
+
+# Rows sent per INSERT statement
+IMPORT_CHUNK_SIZE = 1000
+
+
+def bulk_insert_expenses(
+    db: Session,
+    user_id: UUID,
+    rows: Iterable[Dict[str, Any]],
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> List[Tuple[UUID, str]]:
+    """
+    Insert many expenses for a user with one statement per chunk.
+    
+    Each chunk is sent as a single multi-row INSERT ... RETURNING rather
+    than one INSERT per row, so importing N expenses costs about
+    N / chunk_size round-trips.
+    
+    Args:
+        db: Database session (not committed)
+        user_id: Owner of the expenses
+        rows: Validated expense fields (date_paid, amount, category, description)
+        chunk_size: Maximum rows per INSERT statement
+    
+    Returns:
+        (id, tax_year) of the created expenses, in input order; pass the
+        tax years to invalidate_tax_totals once the session is committed
+    """
+    stmt = insert(Expense).returning(Expense.id, Expense.tax_year, sort_by_parameter_order=True)
+    rows = iter(rows)
+    created: List[Tuple[UUID, str]] = []
+    
+    while chunk := [{**row, "user_id": user_id} for row in islice(rows, chunk_size)]:
+        created.extend(db.execute(stmt, chunk).tuples())
+    
+    return created
@@ -1,8 +1,15 @@
 """Stripe integration service."""
+import orjson
 import stripe
-from typing import Optional
+from typing import Any, Dict, Optional
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
 
+from app.core.cache import invalidate_user
 from app.core.config import settings
+from app.database import SessionLocal
+from app.models.user import User
+from app.models.stripe_event import StripeEvent
 
 stripe.api_key = settings.STRIPE_SECRET_KEY
 
@@ -100,3 +107,96 @@ def cancel_subscription(subscription_id: str) -> None:
         subscription_id: Stripe subscription ID
     """
     stripe.Subscription.delete(subscription_id)
+
+
+def construct_webhook_event(payload: bytes, sig_header: Optional[str]) -> Dict[str, Any]:
+    """
+    Verify a Stripe webhook signature and parse the event payload.
+    
+    Equivalent to stripe.Webhook.construct_event, but parses the payload
+    with orjson into plain dicts instead of building StripeObjects.
+    
+    Args:
+        payload: Raw request body
+        sig_header: Value of the Stripe-Signature header
+    
+    Returns:
+        Parsed event
+    
+    Raises:
+        stripe.error.SignatureVerificationError: If the signature is missing or invalid
+        ValueError: If the payload is not valid JSON
+    """
+    if not sig_header:
+        raise stripe.error.SignatureVerificationError("Missing signature header", sig_header, payload)
+    
+    stripe.WebhookSignature.verify_header(
+        payload.decode("utf-8"),
+        sig_header,
+        settings.STRIPE_WEBHOOK_SECRET,
+        stripe.Webhook.DEFAULT_TOLERANCE,
+    )
+    return orjson.loads(payload)
+
+
+def process_stripe_event(event_id: str, event_type: str, data_object: Dict[str, Any]) -> None:
+    """
+    Apply a verified Stripe webhook event to the matching user's subscription.
+    
+    Each event is applied at most once: the event ID is recorded in the same
+    transaction as the update, so Stripe retries of an already-processed
+    event are ignored, while an event whose transaction failed is applied
+    again on retry.
+    
+    Args:
+        event_id: Stripe event ID
+        event_type: Stripe event type
+        data_object: The event's data.object payload
+    """
+    db = SessionLocal()
+    try:
+        recorded = db.execute(
+            insert(StripeEvent)
+            .values(id=event_id, type=event_type)
+            .on_conflict_do_nothing(index_elements=[StripeEvent.id])
+        )
+        if recorded.rowcount == 0:
+            return
+        
+        # Updates return the changed users so their cached rows can be dropped
+        updated = []
+        
+        if event_type == "checkout.session.completed":
+            # Update user subscription
+            updated = db.scalars(
+                update(User)
+                .where(User.stripe_customer_id == data_object["customer"])
+                .values(
+                    subscription_id=data_object["subscription"],
+                    subscription_status="active",
+                )
+                .returning(User.supabase_id)
+            ).all()
+        
+        elif event_type == "customer.subscription.updated":
+            # Update subscription status
+            updated = db.scalars(
+                update(User)
+                .where(User.subscription_id == data_object["id"])
+                .values(subscription_status=data_object["status"])
+                .returning(User.supabase_id)
+            ).all()
+        
+        elif event_type == "customer.subscription.deleted":
+            # Mark subscription as canceled
+            updated = db.scalars(
+                update(User)
+                .where(User.subscription_id == data_object["id"])
+                .values(subscription_status="canceled")
+                .returning(User.supabase_id)
+            ).all()
+        
+        db.commit()
+        invalidate_user(*updated)
+    finally:
+        db.close()
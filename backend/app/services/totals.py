@@ -0,0 +1,59 @@
+"""Income and expense aggregation service."""
+from datetime import date
+from decimal import Decimal
+from typing import Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models.income import Income
+from app.models.expense import Expense
+
+
+def get_transaction_totals(
+    db: Session,
+    user_id: UUID,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> Tuple[Decimal, Decimal]:
+    """
+    Sum a user's income and expenses in a single database round-trip.
+    
+    Args:
+        db: Database session
+        user_id: Owner of the transactions
+        start_date: First day to include (all time if omitted)
+        end_date: Last day to include, inclusive (all time if omitted)
+    
+    Returns:
+        Tuple of (total_income, total_expenses)
+    """
+    income_filters = [Income.user_id == user_id]
+    expense_filters = [Expense.user_id == user_id]
+    
+    if start_date and end_date:
+        income_filters.append(Income.date_received.between(start_date, end_date))
+        expense_filters.append(Expense.date_paid.between(start_date, end_date))
+    elif start_date:
+        income_filters.append(Income.date_received >= start_date)
+        expense_filters.append(Expense.date_paid >= start_date)
+    elif end_date:
+        income_filters.append(Income.date_received <= end_date)
+        expense_filters.append(Expense.date_paid <= end_date)
+    
+    # Both sums are fetched together, keyed by "kind"
+    stmt = union_all(
+        select(
+            literal("income").label("kind"),
+            func.coalesce(func.sum(Income.amount), Decimal("0.00")).label("total"),
+        ).where(and_(*income_filters)),
+        select(
+            literal("expense").label("kind"),
+            func.coalesce(func.sum(Expense.amount), Decimal("0.00")).label("total"),
+        ).where(and_(*expense_filters)),
+    )
+    
+    totals = dict(db.execute(stmt).all())
+    
+    return totals["income"], totals["expense"]
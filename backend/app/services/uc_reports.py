@@ -0,0 +1,127 @@
+"""Universal Credit report generation service."""
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, List, Tuple, Union
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, Date, ScalarSelect, and_, column, func, literal, select, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert
+from sqlalchemy.orm import Session
+
+from app.models.income import Income
+from app.models.expense import Expense
+from app.models.uc_report import UCReport
+from app.core.dates import get_uc_assessment_period
+
+
+def period_totals(
+    user_id: UUID,
+    period_start: Union[date, ColumnElement],
+    period_end: Union[date, ColumnElement],
+) -> Tuple[ScalarSelect, ScalarSelect]:
+    """
+    Build scalar subqueries summing a user's income and expenses in a period.
+    
+    The bounds may be dates or column expressions, so the sums can be
+    embedded in a larger query or correlated against a set of periods.
+    
+    Args:
+        user_id: Owner of the transactions
+        period_start: First day of the period
+        period_end: Last day of the period, inclusive
+    
+    Returns:
+        Tuple of (income_sum, expense_sum) scalar subqueries
+    """
+    income_sum = select(
+        func.coalesce(func.sum(Income.amount), Decimal("0.00"))
+    ).where(
+        and_(
+            Income.user_id == user_id,
+            Income.date_received.between(period_start, period_end),
+        )
+    ).scalar_subquery()
+    
+    expense_sum = select(
+        func.coalesce(func.sum(Expense.amount), Decimal("0.00"))
+    ).where(
+        and_(
+            Expense.user_id == user_id,
+            Expense.date_paid.between(period_start, period_end),
+        )
+    ).scalar_subquery()
+    
+    return income_sum, expense_sum
+
+
+def generate_uc_reports_bulk(
+    db: Session,
+    user_id: UUID,
+    assessment_day: int,
+    period_dates: Iterable[date],
+) -> List[UCReport]:
+    """
+    Create UC reports for several assessment periods in one statement.
+    
+    Totals are aggregated and inserted by a single INSERT ... SELECT, so
+    backfilling many periods costs one round-trip. Periods that already
+    have a report are skipped.
+    
+    Args:
+        db: Database session (not committed)
+        user_id: Owner of the reports
+        assessment_day: Day of month the user's periods start (1-28)
+        period_dates: Any date within each period to generate
+    
+    Returns:
+        Newly created reports, ordered by period start
+    """
+    periods = sorted({get_uc_assessment_period(d, assessment_day) for d in period_dates})
+    if not periods:
+        return []
+    
+    period_rows = values(
+        column("period_start", Date),
+        column("period_end", Date),
+        name="periods",
+    ).data(periods)
+    
+    # Correlated per period, so each sum is an index range scan on (user_id, date)
+    income_sum, expense_sum = period_totals(
+        user_id, period_rows.c.period_start, period_rows.c.period_end
+    )
+    
+    # Python-side column defaults don't apply to INSERT ... SELECT, so supply them here
+    now = func.timezone("utc", func.now())
+    report_rows = select(
+        func.gen_random_uuid(),
+        literal(user_id, PG_UUID(as_uuid=True)),
+        period_rows.c.period_start,
+        period_rows.c.period_end,
+        income_sum,
+        expense_sum,
+        income_sum - expense_sum,
+        now,
+        now,
+    )
+    
+    stmt = insert(UCReport).from_select(
+        [
+            UCReport.id,
+            UCReport.user_id,
+            UCReport.period_start,
+            UCReport.period_end,
+            UCReport.total_income,
+            UCReport.total_expenses,
+            UCReport.net_profit,
+            UCReport.created_at,
+            UCReport.updated_at,
+        ],
+        report_rows,
+    ).on_conflict_do_nothing(
+        index_elements=[UCReport.user_id, UCReport.period_start],
+    ).returning(UCReport)
+    
+    reports = db.scalars(stmt).all()
+    
+    return sorted(reports, key=lambda report: report.period_start)
@@ -0,0 +1,54 @@
+"""Shared test fixtures."""
+import pytest
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+import app.database
+
+
+class RecordedResult:
+    """Rows returned by the recording session for one statement."""
+    
+    def __init__(self, rows):
+        self.rows = list(rows)
+    
+    def tuples(self):
+        return iter(self.rows)
+    
+    def scalars(self):
+        return RecordedResult(row[0] for row in self.rows)
+    
+    def all(self):
+        return list(self.rows)
+    
+    def scalar_one_or_none(self):
+        return self.rows[0][0] if self.rows else None
+
+
+class RecordingSession(Session):
+    """
+    Unbound session that records executed statements instead of sending them.
+    
+    Each statement gets the rows returned by respond(statement, params);
+    everything else (merge, identity map) behaves like a real session.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.respond = lambda statement, params: []
+        self.statements = []
+    
+    def execute(self, statement, params=None, **kwargs):
+        self.statements.append((statement, params))
+        return RecordedResult(self.respond(statement, params))
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """Recording session, with statements built for PostgreSQL."""
+    monkeypatch.setattr(app.database, "engine", SimpleNamespace(dialect=postgresql.dialect()))
+    session = RecordingSession()
+    yield session
+    session.close()
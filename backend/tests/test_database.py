@@ -0,0 +1,44 @@
+"""Tests for database helpers."""
+import pytest
+from types import SimpleNamespace
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+import app.database
+from app.database import in_array
+from app.models.user import User
+
+
+class TestInArray:
+    """Test array-bound IN filters."""
+    
+    def test_postgresql_binds_one_array(self, monkeypatch):
+        """Test PostgreSQL gets a single array parameter cast to the column type."""
+        monkeypatch.setattr(app.database, "engine", SimpleNamespace(dialect=postgresql.dialect()))
+        ids = [uuid4(), uuid4(), uuid4()]
+        
+        compiled = in_array(User.id, ids).compile(dialect=postgresql.dialect())
+        
+        assert str(compiled) == "users.id IN (SELECT unnest(%(param_1)s::UUID[]) AS unnest_1)"
+        assert compiled.params == {"param_1": ids}
+    
+    def test_postgresql_casts_to_column_type(self, monkeypatch):
+        """Test the array cast follows the filtered column's type."""
+        monkeypatch.setattr(app.database, "engine", SimpleNamespace(dialect=postgresql.dialect()))
+        
+        compiled = in_array(User.supabase_id, iter(["a", "b"])).compile(dialect=postgresql.dialect())
+        
+        assert "unnest(%(param_1)s::VARCHAR[])" in str(compiled)
+        assert compiled.params == {"param_1": ["a", "b"]}
+    
+    def test_other_dialects_use_in_list(self, monkeypatch):
+        """Test other dialects fall back to a plain IN list."""
+        monkeypatch.setattr(app.database, "engine", SimpleNamespace(dialect=sqlite.dialect()))
+        
+        compiled = in_array(User.supabase_id, ["a", "b"]).compile(
+            dialect=sqlite.dialect(),
+            compile_kwargs={"literal_binds": True},
+        )
+        
+        assert str(compiled) == "users.supabase_id IN ('a', 'b')"
@@ -31,6 +31,16 @@ class TestTaxYearCalculations:
         tax_year = get_tax_year(date(2024, 6, 1))
         assert tax_year == "2024-25"
     
+    def test_get_tax_year_on_april_5(self):
+        """Test tax year for April 5 (last day of tax year)."""
+        tax_year = get_tax_year(date(2025, 4, 5))
+        assert tax_year == "2024-25"
+    
+    def test_get_tax_year_century_rollover(self):
+        """Test end year suffix is zero-padded across a century."""
+        assert get_tax_year(date(2099, 6, 1)) == "2099-00"
+        assert get_tax_year(date(2108, 6, 1)) == "2108-09"
+    
     def test_get_tax_year_dates(self):
         """Test getting start and end dates for tax year."""
         start, end = get_tax_year_dates("2024-25")
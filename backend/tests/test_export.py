@@ -0,0 +1,72 @@
+"""Tests for data export service."""
+import pytest
+from types import SimpleNamespace
+from datetime import date, datetime
+from decimal import Decimal
+
+from app.services.export import (
+    CSV_CHUNK_SIZE,
+    generate_transactions_csv,
+    iter_transactions_csv,
+)
+
+
+def make_income(**overrides):
+    """Build an income-like row for export tests."""
+    fields = {
+        "date_received": date(2024, 6, 1),
+        "amount": Decimal("1000.00"),
+        "description": "Client work",
+        "tax_year": "2024-25",
+        "created_at": datetime(2024, 6, 1, 12, 0, 0),
+    }
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+def make_expense(**overrides):
+    """Build an expense-like row for export tests."""
+    fields = {
+        "date_paid": date(2024, 6, 2),
+        "amount": Decimal("49.99"),
+        "description": "Laptop stand",
+        "category": "Equipment",
+        "tax_year": "2024-25",
+        "created_at": datetime(2024, 6, 2, 9, 30, 0),
+    }
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+class TestTransactionsCsv:
+    """Test CSV export of transactions."""
+    
+    def test_csv_rows(self):
+        """Test header, income and expense rows are formatted."""
+        csv_content = generate_transactions_csv([make_income()], [make_expense()])
+        
+        assert csv_content.splitlines() == [
+            "Type,Date,Amount,Description,Category,Tax Year,Created At",
+            "Income,2024-06-01,1000.00,Client work,,2024-25,2024-06-01T12:00:00",
+            "Expense,2024-06-02,49.99,Laptop stand,Equipment,2024-25,2024-06-02T09:30:00",
+        ]
+    
+    def test_csv_quotes_special_characters(self):
+        """Test descriptions containing commas and quotes are escaped."""
+        csv_content = generate_transactions_csv(
+            [make_income(description='Invoice "A", part 1')],
+            [],
+        )
+        
+        assert '"Invoice ""A"", part 1"' in csv_content
+    
+    def test_csv_streams_in_chunks(self):
+        """Test large exports are yielded in bounded chunks."""
+        incomes = [make_income() for _ in range(5000)]
+        expenses = [make_expense() for _ in range(5000)]
+        
+        chunks = list(iter_transactions_csv(iter(incomes), iter(expenses)))
+        
+        assert len(chunks) > 1
+        assert all(len(chunk) < CSV_CHUNK_SIZE * 2 for chunk in chunks)
+        assert "".join(chunks) == generate_transactions_csv(incomes, expenses)
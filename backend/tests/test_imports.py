@@ -0,0 +1,65 @@
+"""Tests for bulk transaction import service."""
+import pytest
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.core.dates import get_tax_year
+from app.services.imports import bulk_insert_expenses
+
+
+def respond_with_created(statement, params):
+    """Answer an expense INSERT with an id and tax year per inserted row."""
+    return [(uuid4(), get_tax_year(row["date_paid"])) for row in params]
+
+
+def make_rows(*dates_paid):
+    """Build validated expense fields for import tests."""
+    return [
+        {
+            "date_paid": date_paid,
+            "amount": Decimal("12.50"),
+            "category": "Other",
+            "description": "Imported",
+        }
+        for date_paid in dates_paid
+    ]
+
+
+class TestBulkInsertExpenses:
+    """Test chunked bulk insert of expenses."""
+    
+    def test_rows_sent_in_chunks(self, db):
+        """Test rows are split into one statement per chunk, tagged with the owner."""
+        db.respond = respond_with_created
+        user_id = uuid4()
+        
+        bulk_insert_expenses(db, user_id, make_rows(*[date(2024, 6, day) for day in range(1, 6)]), chunk_size=2)
+        
+        assert [len(params) for _, params in db.statements] == [2, 2, 1]
+        assert all(row["user_id"] == user_id for _, params in db.statements for row in params)
+    
+    def test_returns_ids_and_tax_years(self, db):
+        """Test created ids come back with their tax years, in input order."""
+        db.respond = respond_with_created
+        
+        created = bulk_insert_expenses(db, uuid4(), make_rows(date(2024, 4, 5), date(2024, 4, 6)), chunk_size=1)
+        
+        assert [tax_year for _, tax_year in created] == ["2023-24", "2024-25"]
+        assert len({expense_id for expense_id, _ in created}) == 2
+    
+    def test_returning_clause(self, db):
+        """Test the statement reads back the generated tax year column."""
+        db.respond = respond_with_created
+        
+        bulk_insert_expenses(db, uuid4(), make_rows(date(2024, 6, 1)))
+        
+        sql = str(db.statements[0][0].compile(dialect=postgresql.dialect()))
+        assert sql.endswith("RETURNING expenses.id, expenses.tax_year")
+    
+    def test_empty_import(self, db):
+        """Test no statement is sent when there is nothing to import."""
+        assert bulk_insert_expenses(db, uuid4(), []) == []
+        assert db.statements == []
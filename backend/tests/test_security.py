@@ -0,0 +1,200 @@
+"""Tests for authentication and security utilities."""
+import pytest
+from types import SimpleNamespace
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import make_transient_to_detached
+
+import app.core.security
+from app.core.cache import MemoryCache, invalidate_user
+from app.core.security import (
+    _dump_user,
+    _load_cached_user,
+    get_user_by_supabase_id,
+    prefetch_users_by_supabase_ids,
+)
+from app.models.user import User
+
+
+def chunk_ids(db):
+    """Supabase IDs bound to each user query the session received."""
+    chunks = []
+    for statement, _ in db.statements:
+        compiled = statement.compile(dialect=postgresql.dialect())
+        assert "users.supabase_id IN (SELECT unnest(%(param_1)s::VARCHAR[])" in str(compiled)
+        chunks.append(compiled.params["param_1"])
+    return chunks
+
+
+def respond_with_users(*known_ids):
+    """Answer a user query with one user per known ID it asks for."""
+    def respond(statement, params):
+        ids = statement.compile(dialect=postgresql.dialect()).params["param_1"]
+        return [(SimpleNamespace(supabase_id=supabase_id),) for supabase_id in ids if supabase_id in known_ids]
+    return respond
+
+
+class TestPrefetchUsers:
+    """Test chunked prefetching of users by supabase ID."""
+    
+    def test_one_query_per_chunk(self, db):
+        """Test IDs are split into chunks of at most chunk_size."""
+        ids = [f"sub{i}" for i in range(5)]
+        db.respond = respond_with_users(*ids)
+        
+        users = list(prefetch_users_by_supabase_ids(db, iter(ids), chunk_size=2))
+        
+        assert chunk_ids(db) == [["sub0", "sub1"], ["sub2", "sub3"], ["sub4"]]
+        assert [user.supabase_id for user in users] == ids
+    
+    def test_chunks_fetched_lazily(self, db):
+        """Test each chunk is only queried once the previous users are consumed."""
+        db.respond = respond_with_users("sub0", "sub1", "sub2")
+        users = prefetch_users_by_supabase_ids(db, ["sub0", "sub1", "sub2"], chunk_size=2)
+        
+        assert db.statements == []
+        
+        next(users)
+        next(users)
+        
+        assert len(db.statements) == 1
+        
+        next(users)
+        
+        assert len(db.statements) == 2
+    
+    def test_unknown_ids_skipped(self, db):
+        """Test IDs without a user are skipped."""
+        db.respond = respond_with_users("sub1")
+        
+        users = list(prefetch_users_by_supabase_ids(db, ["sub0", "sub1", "sub2"]))
+        
+        assert [user.supabase_id for user in users] == ["sub1"]
+        assert chunk_ids(db) == [["sub0", "sub1", "sub2"]]
+    
+    def test_no_ids(self, db):
+        """Test no query is sent for an empty ID list."""
+        assert list(prefetch_users_by_supabase_ids(db, [])) == []
+        assert db.statements == []
+
+
+def make_user(**overrides):
+    """Build a user with every kind of column value set."""
+    fields = {
+        "id": uuid4(),
+        "supabase_id": "sub0",
+        "email": "sole.trader@example.com",
+        "full_name": None,
+        "trading_start_date": date(2023, 4, 6),
+        "uc_enabled": True,
+        "uc_assessment_day": 14,
+        "tax_set_aside_percentage": Decimal("22.50"),
+        "stripe_customer_id": None,
+        "subscription_status": "active",
+        "subscription_id": "sub_123",
+        "created_at": datetime(2024, 6, 1, 12, 30, 15, 250000),
+        "updated_at": datetime(2024, 6, 2, 8, 0, 0),
+    }
+    fields.update(overrides)
+    return User(**fields)
+
+
+@pytest.fixture
+def shared_cache(monkeypatch):
+    """Serve users from a cache that behaves like the shared Redis backend."""
+    cache = MemoryCache()
+    cache.shared = True
+    monkeypatch.setattr(app.core.security, "cache", cache)
+    monkeypatch.setattr(app.core.cache, "cache", cache)
+    return cache
+
+
+class TestCachedUserRoundTrip:
+    """Test user rows survive the cache unchanged."""
+    
+    def test_column_values_restored(self):
+        """Test UUID, Decimal, date, datetime, bool and None columns keep their types."""
+        user = make_user()
+        
+        values = _load_cached_user(_dump_user(user, 3), 3)
+        
+        for column in User.__table__.columns:
+            assert values[column.key] == getattr(user, column.key)
+            assert type(values[column.key]) is type(getattr(user, column.key))
+    
+    def test_older_version_ignored(self):
+        """Test an entry stored under an older version is not restored."""
+        assert _load_cached_user(_dump_user(make_user(), 3), 4) is None
+    
+    def test_merged_user_is_persistent_and_clean(self, db):
+        """Test a restored user joins the session as if it had been queried."""
+        user = make_user()
+        cached = User(**_load_cached_user(_dump_user(user, 1), 1))
+        make_transient_to_detached(cached)
+        
+        merged = db.merge(cached, load=False)
+        
+        assert inspect(merged).persistent
+        assert not db.dirty
+        assert merged.tax_set_aside_percentage == Decimal("22.50")
+        assert merged.full_name is None
+        assert db.statements == []
+
+
+class TestGetUserBySupabaseId:
+    """Test cached user lookups."""
+    
+    def test_per_process_cache_not_used(self, db, monkeypatch):
+        """Test every lookup queries the database when the cache isn't shared."""
+        monkeypatch.setattr(app.core.security, "cache", MemoryCache())
+        user = make_user()
+        db.respond = lambda statement, params: [(user,)]
+        
+        get_user_by_supabase_id(db, "sub0")
+        get_user_by_supabase_id(db, "sub0")
+        
+        assert len(db.statements) == 2
+    
+    def test_second_lookup_served_from_cache(self, db, shared_cache):
+        """Test a cached user is returned without a query."""
+        db.respond = lambda statement, params: [(make_user(),)]
+        
+        get_user_by_supabase_id(db, "sub0")
+        user = get_user_by_supabase_id(db, "sub0")
+        
+        assert len(db.statements) == 1
+        assert user.subscription_status == "active"
+    
+    def test_invalidated_user_reloaded(self, db, shared_cache):
+        """Test a lookup after invalidate_user queries the database again."""
+        db.respond = lambda statement, params: [(make_user(),)]
+        get_user_by_supabase_id(db, "sub0")
+        db.expunge_all()
+        
+        invalidate_user("sub0")
+        db.respond = lambda statement, params: [(make_user(subscription_status="canceled"),)]
+        user = get_user_by_supabase_id(db, "sub0")
+        
+        assert len(db.statements) == 2
+        assert user.subscription_status == "canceled"
+    
+    def test_row_loaded_before_invalidation_not_served(self, db, shared_cache):
+        """Test a stale row cached after a concurrent invalidation is never served."""
+        def respond_then_invalidate(statement, params):
+            # The row is read, then the user changes before it reaches the cache
+            invalidate_user("sub0")
+            return [(make_user(subscription_status="active"),)]
+        
+        db.respond = respond_then_invalidate
+        get_user_by_supabase_id(db, "sub0")
+        db.expunge_all()
+        
+        db.respond = lambda statement, params: [(make_user(subscription_status="canceled"),)]
+        user = get_user_by_supabase_id(db, "sub0")
+        
+        assert len(db.statements) == 2
+        assert user.subscription_status == "canceled"
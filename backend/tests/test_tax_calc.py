@@ -8,8 +8,10 @@ from app.core.tax_calc import (
     calculate_ni_class2,
     calculate_ni_class4,
     calculate_total_tax,
+    calculate_income_tax_pence,
+    recommend_tax_set_aside_percentage,
 )
-from app.core.tax_rulesets import get_ruleset_for_date
+from app.core.tax_rulesets import get_decimal_ruleset_for_date
 
 
 class TestTaxCalculations:
@@ -17,7 +19,7 @@ class TestTaxCalculations:
     
     def test_income_tax_below_personal_allowance(self):
         """Test income tax when profit is below personal allowance."""
-        ruleset = get_ruleset_for_date(date(2024, 6, 1))
+        ruleset = get_decimal_ruleset_for_date(date(2024, 6, 1))
         profit = Decimal("10000.00")
         
         tax = calculate_income_tax(profit, ruleset)
@@ -26,7 +28,7 @@ class TestTaxCalculations:
     
     def test_income_tax_basic_rate(self):
         """Test income tax in basic rate band."""
-        ruleset = get_ruleset_for_date(date(2024, 6, 1))
+        ruleset = get_decimal_ruleset_for_date(date(2024, 6, 1))
         profit = Decimal("30000.00")
         
         tax = calculate_income_tax(profit, ruleset)
@@ -37,7 +39,7 @@ class TestTaxCalculations:
     
     def test_ni_class2_below_threshold(self):
         """Test NI Class 2 below small profits threshold."""
-        ruleset = get_ruleset_for_date(date(2024, 6, 1))
+        ruleset = get_decimal_ruleset_for_date(date(2024, 6, 1))
         profit = Decimal("6000.00")
         
         ni = calculate_ni_class2(profit, ruleset)
@@ -46,7 +48,7 @@ class TestTaxCalculations:
     
     def test_ni_class2_above_threshold(self):
         """Test NI Class 2 above small profits threshold."""
-        ruleset = get_ruleset_for_date(date(2024, 6, 1))
+        ruleset = get_decimal_ruleset_for_date(date(2024, 6, 1))
         profit = Decimal("10000.00")
         
         ni = calculate_ni_class2(profit, ruleset)
@@ -56,7 +58,7 @@ class TestTaxCalculations:
     
     def test_ni_class4_below_threshold(self):
         """Test NI Class 4 below lower threshold."""
-        ruleset = get_ruleset_for_date(date(2024, 6, 1))
+        ruleset = get_decimal_ruleset_for_date(date(2024, 6, 1))
         profit = Decimal("10000.00")
         
         ni = calculate_ni_class4(profit, ruleset)
@@ -65,7 +67,7 @@ class TestTaxCalculations:
     
     def test_ni_class4_main_rate(self):
         """Test NI Class 4 in main rate band."""
-        ruleset = get_ruleset_for_date(date(2024, 6, 1))
+        ruleset = get_decimal_ruleset_for_date(date(2024, 6, 1))
         profit = Decimal("30000.00")
         
         ni = calculate_ni_class4(profit, ruleset)
@@ -107,3 +109,48 @@ class TestTaxCalculations:
         # Test 2024-25 tax year
         result_2024 = calculate_total_tax(profit, date(2024, 6, 1))
         assert result_2024["tax_year"] == "2024-25"
+    
+    def test_decimal_ruleset_precomputes_bands(self):
+        """Test that the Decimal ruleset carries converted values and band limits."""
+        ruleset = get_decimal_ruleset_for_date(date(2024, 6, 1))
+        
+        assert ruleset["basic_rate"] == Decimal("0.2")
+        assert ruleset["basic_band_limit"] == Decimal("37700")
+        assert ruleset["higher_band_limit"] == Decimal("74870")
+        assert ruleset["ni_class2_annual"] == Decimal("179.40")
+        assert ruleset["version"] == "2024-25-v1"
+    
+    def test_income_tax_pence_higher_rate(self):
+        """Test integer-pence income tax across the higher rate band."""
+        ruleset = get_decimal_ruleset_for_date(date(2024, 6, 1))
+        
+        tax = calculate_income_tax_pence(6000000, ruleset["pence"])
+        
+        # £37,700 * 20% + £9,730 * 40% = £7,540 + £3,892 = £11,432
+        assert tax == 1143200
+        assert calculate_income_tax(Decimal("60000.00"), ruleset) == Decimal("11432.00")
+    
+    def test_total_tax_results_are_independent_copies(self):
+        """Test that memoised results can be modified without affecting later calls."""
+        result = calculate_total_tax(Decimal("30000.00"), date(2024, 6, 1))
+        result["total_tax"] = 0
+        
+        again = calculate_total_tax(Decimal("30000.00"), date(2024, 7, 1))
+        
+        assert again["total_tax"] == Decimal("5234.10")
+    
+    def test_recommendation_percentage_and_reason(self):
+        """Test the set-aside recommendation and its profit threshold boundaries."""
+        tax_date = date(2024, 6, 1)
+        
+        result = recommend_tax_set_aside_percentage(Decimal("30000.00"), tax_date)
+        
+        # £5,234.10 / £30,000 = 17.4%, plus a 5% buffer, rounded up to 25%
+        assert result["recommended_percentage"] == 25
+        assert result["effective_tax_rate"] == 17.4
+        assert result["reason"] == "Higher basic rate income - increased NI contributions"
+        
+        below = recommend_tax_set_aside_percentage(Decimal("12569.99"), tax_date)
+        at = recommend_tax_set_aside_percentage(Decimal("12570.00"), tax_date)
+        assert below["reason"] == "Below Personal Allowance - minimal tax expected"
+        assert at["reason"] == "Basic rate taxpayer - 20% Income Tax + NI"